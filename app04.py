@@ -5,13 +5,19 @@
 # 3. Dynamic x-axis scaling based on actual data distribution
 # 4. Added collapsible insights section with natural language takeaways
 
+# Only light imports up front: the title, state selector and metric cards are
+# drawn with pandas alone, and the geospatial stack is loaded after that
+import os
+
 import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 import streamlit as st
-from pygris import tracts
-import geopandas as gpd
+from trauma_access import (
+    access_summary, bin_distances, cache_report, comparison_chart, cost_raster_version,
+    distance_histogram, distribution_frame, finish_run, generate_insights, has_cost_raster,
+    histogram_chart, histogram_image, hospital_deck, list_states, load_geo_stack,
+    load_summaries, prefetch_next, ranking_table, render_histogram, stage, stage_summary,
+    start_run, state_metrics, view_for,
+)
 
 st.set_page_config(layout="wide")
 
@@ -73,252 +79,297 @@ st.title("US Trauma Hospital Locations")
 #st.caption("A sample Streamlit app to visualize US trauma hospital locations. Based on Posit tutorial, with extensive help from Positron AI assistant.", fontsize="medium")
 st.markdown('<div class="custom-caption">An example Streamlit app to visualize US trauma hospital locations. Based on Posit tutorial, with extensive help from Positron AI assistant.</div>', unsafe_allow_html=True)
 
-# Load all trauma data to get unique states
-@st.cache_data
-def load_all_trauma_data():
-    trauma_all = gpd.read_file('trauma.geojson')
-    return trauma_all
+# Per-stage timings for this rerun; shown in the developer panel (?dev=1 or
+# TRAUMA_DEV_PANEL=1) and logged as one JSON line when the run finishes
+run = start_run('app04')
+dev_panel = st.query_params.get('dev') == '1' or os.environ.get('TRAUMA_DEV_PANEL') == '1'
 
-# Get available states for the selectbox
-trauma_all = load_all_trauma_data()
-available_states = sorted(trauma_all['STATE'].unique())
+# Get available states for the selectbox (from the small metrics table, no geometry)
+available_states = list_states()
 
 with st.sidebar:
+    view = st.radio('View', ('State detail', 'Compare states'), horizontal=True)
     st.write('## Select State of Interest')
     state = st.selectbox('State', options=available_states, index=available_states.index('AK'))
+    chart_style = st.radio('Chart style', options=('Image', 'Interactive'), horizontal=True)
+    show_tracts = st.checkbox('Shade tracts by distance to nearest trauma center')
+    show_areas = st.checkbox('Outline hospital service areas')
 
-@st.cache_data
-def get_data(st_filter):
-    state_tracts = tracts(st_filter, cb=True, 
-                            year=2021, 
-                            cache=True).to_crs(6571)
-    state_tracts = state_tracts.to_crs('EPSG:4326')
-    return(state_tracts)
-
-state_tracts = get_data(state)
+run.context['state'] = state
 
-@st.cache_data
-def load_data(state):
-    trauma = gpd.read_file('trauma.geojson')
-    trauma = trauma[trauma['STATE'] == state]
-    return(trauma)
+# Comparison view: served from the compact per-state summary table (metric
+# cards, quantiles and counts on fixed 5 km bins) rather than tract data, so
+# comparing 10 or 51 states costs about the same as one
+if view == 'Compare states':
+    rank_labels = {
+        'mean': 'Mean distance', 'p50': 'Median distance', 'p90': '90th percentile distance',
+        'within_30km': 'Share within 30 km', 'within_60km': 'Share within 60 km',
+    }
+    with st.sidebar:
+        compared = st.multiselect('States to compare', options=available_states, default=[state])
+        rank_by = st.selectbox('Rank states by', options=list(rank_labels), format_func=rank_labels.get)
 
-trauma = load_data(state)
+    with stage('summaries', states=len(compared)):
+        summaries = load_summaries()
+        missing = [s for s in compared if summaries is None or s not in summaries.index]
+        if missing:
+            # Only states without published results need the geospatial stack
+            load_geo_stack()
+            from trauma_access import api
+            extra = api.state_summaries(missing)
+            summaries = extra if summaries is None else pd.concat([summaries, extra])
+    if summaries is None:
+        st.info('No published results yet: run `python -m trauma_access precompute`, or pick states to compare.')
+        finish_run()
+        st.stop()
+    compared = [s for s in compared if s in summaries.index]
+    unit_note = 'residents' if summaries['weighted'].any() else 'census tracts'
 
-# Calculate summary metrics
-def calculate_metrics(trauma_df):
-    total_hospitals = len(trauma_df)
-    
-    # Count helipads (Y = yes)
-    total_helipads = (trauma_df['HELIPAD'] == 'Y').sum()
-    
-    # Count Level 1 trauma centers (including combinations with Level 1)
-    level_1_centers = trauma_df['TRAUMA'].str.contains('LEVEL I', na=False).sum()
-    
-    # Calculate total beds for Level 1 trauma centers
-    level_1_trauma_df = trauma_df[trauma_df['TRAUMA'].str.contains('LEVEL I', na=False)]
-    level_1_beds = level_1_trauma_df['BEDS'].sum()
-    
-    return {
-        'hospitals': total_hospitals,
-        'helipads': total_helipads,
-        'level_1_centers': level_1_centers,
-        'level_1_beds': level_1_beds
-    }
+    st.markdown(f"# 📊 Comparing {len(compared)} States")
+    st.markdown("---")
+    if compared:
+        st.dataframe(
+            summaries.loc[compared, ['hospitals', 'level_1_centers', 'level_1_beds', 'mean', 'p50', 'p90',
+                                     'max', 'within_30km', 'within_60km']],
+            column_config={
+                'hospitals': st.column_config.NumberColumn('Hospitals'),
+                'level_1_centers': st.column_config.NumberColumn('Lvl 1 Trauma Ctrs'),
+                'level_1_beds': st.column_config.NumberColumn('Lvl 1 Beds'),
+                'mean': st.column_config.NumberColumn('Mean (km)', format='%.1f'),
+                'p50': st.column_config.NumberColumn('Median (km)', format='%.1f'),
+                'p90': st.column_config.NumberColumn('90th pct (km)', format='%.1f'),
+                'max': st.column_config.NumberColumn('Max (km)', format='%.1f'),
+                'within_30km': st.column_config.ProgressColumn('Within 30 km', min_value=0, max_value=1, format='%.2f'),
+                'within_60km': st.column_config.ProgressColumn('Within 60 km', min_value=0, max_value=1, format='%.2f'),
+            },
+        )
+        with stage('figure', chart='comparison'):
+            col_c1, col_c2 = st.columns(2)
+            with col_c1:
+                st.altair_chart(comparison_chart(distribution_frame(summaries, compared)), use_container_width=True)
+            with col_c2:
+                st.altair_chart(comparison_chart(distribution_frame(summaries, compared, cumulative=True),
+                                                 cumulative=True), use_container_width=True)
+        st.caption(f'Distances from tract centroids to the nearest trauma center; shares are of {unit_note}.')
 
-# Function to generate insights based on distance statistics
-def generate_insights(state, mean_dist, median_dist, max_dist, metrics):
-    insights = []
-    
-    # Accessibility assessment based on mean distance
-    if mean_dist <= 10:
-        insights.append(f"<strong>Excellent Access</strong>: {state} has excellent trauma care accessibility with an average distance of {mean_dist:.1f} km to the nearest trauma center.")
-    elif mean_dist <= 25:
-        insights.append(f"<strong>Good Access</strong>: {state} provides reasonable trauma care access, with most residents within {mean_dist:.1f} km of emergency care.")
-    elif mean_dist <= 50:
-        insights.append(f"<strong>Moderate Access</strong>: {state} has moderate trauma care accessibility, with residents traveling an average of {mean_dist:.1f} km to reach care.")
-    else:
-        insights.append(f"<strong>Limited Access</strong>: {state} faces accessibility challenges, with residents traveling {mean_dist:.1f} km on average to reach trauma care.")
-    
-    # Distribution analysis (mean vs median comparison)
-    diff_percentage = abs(mean_dist - median_dist) / median_dist * 100
-    if diff_percentage < 10:
-        insights.append(f"<strong>Even Distribution</strong>: The mean ({mean_dist:.1f} km) and median ({median_dist:.1f} km) distances are very close, indicating fairly even trauma center distribution across the state.")
-    elif mean_dist > median_dist * 1.2:
-        insights.append(f"<strong>Geographic Disparities</strong>: Some areas face significantly longer travel distances (mean {mean_dist:.1f} km vs median {median_dist:.1f} km), suggesting rural or remote areas with limited access.")
-    else:
-        insights.append(f"<strong>Slight Variation</strong>: There's some variation in access across the state, with mean distance ({mean_dist:.1f} km) slightly different from median ({median_dist:.1f} km).")
-    
-    # Maximum distance analysis
-    if max_dist > 100:
-        insights.append(f"<strong>Remote Areas</strong>: Some residents face extreme distances up to {max_dist:.1f} km to reach trauma care, likely in very rural or isolated regions.")
-    elif max_dist > 50:
-        insights.append(f"<strong>Rural Challenges</strong>: The maximum distance of {max_dist:.1f} km indicates some rural areas have limited trauma care access.")
-    else:
-        insights.append(f"<strong>Reasonable Coverage</strong>: Even the most remote areas are within {max_dist:.1f} km of trauma care, showing good statewide coverage.")
-    
-    # Helipad analysis
-    helipad_percentage = (metrics['helipads'] / metrics['hospitals']) * 100 if metrics['hospitals'] > 0 else 0
-    if helipad_percentage > 50:
-        insights.append(f"<strong>Air Transport Ready</strong>: {helipad_percentage:.0f}% of trauma hospitals have helipads, providing excellent air transport capabilities for critical patients from remote areas.")
-    elif helipad_percentage > 25:
-        insights.append(f"<strong>Moderate Air Access</strong>: {helipad_percentage:.0f}% of hospitals have helipads, offering some air transport options for emergency cases.")
-    else:
-        insights.append(f"<strong>Limited Air Transport</strong>: Only {helipad_percentage:.0f}% of hospitals have helipads, which may impact rapid transport from distant locations.")
-    
-    # Level 1 trauma center assessment
-    level1_percentage = (metrics['level_1_centers'] / metrics['hospitals']) * 100 if metrics['hospitals'] > 0 else 0
-    if metrics['level_1_centers'] == 0:
-        insights.append(f"<strong>No Level 1 Centers</strong>: {state} has no Level 1 trauma centers, meaning the most critical cases may need transfer to neighboring states.")
-    elif level1_percentage > 25:
-        insights.append(f"<strong>Strong Critical Care</strong>: {metrics['level_1_centers']} Level 1 trauma centers ({level1_percentage:.0f}% of hospitals) provide excellent critical care capacity.")
-    else:
-        insights.append(f"<strong>Limited Level 1 Care</strong>: {metrics['level_1_centers']} Level 1 trauma center(s) serve the entire state, which may strain resources during major incidents.")
-    
-    return insights
+    st.markdown(f"## 🏆 National Ranking: {rank_labels[rank_by]}")
+    ranking_columns = ['rank', *dict.fromkeys([rank_by, 'hospitals', 'mean', 'p50', 'p90', 'within_30km'])]
+    st.dataframe(ranking_table(summaries, rank_by)[ranking_columns], height=500)
+    st.caption(f'{len(summaries)} states with published results; best first.')
+    finish_run()
+    st.stop()
 
-metrics = calculate_metrics(trauma)
+# Summary metrics are a row lookup in the all-states table (one grouped pass, cached)
+with stage('metrics'):
+    metrics = state_metrics(state)
 
 # Display summary metrics with enhanced styling
 st.markdown(f"# 📊 Summary Metrics for {state}")
 st.markdown("---")  # Add a horizontal line for visual separation
 
-col_m1, col_m2, col_m3, col_m4 = st.columns(4)
-
-with col_m1:
-    st.markdown(f"""
-    <div class="metric-container">
-        <div class="metric-label">Total Hospitals</div>
-        <div class="metric-value">{metrics['hospitals']}</div>
-    </div>
-    """, unsafe_allow_html=True)
-
-with col_m2:
-    st.markdown(f"""
-    <div class="metric-container">
-        <div class="metric-label">Hospitals w/ Helipads</div>
-        <div class="metric-value">{metrics['helipads']}</div>
-    </div>
-    """, unsafe_allow_html=True)
-
-with col_m3:
-    st.markdown(f"""
-    <div class="metric-container">
-        <div class="metric-label">Lvl 1 Trauma Ctrs</div>
-        <div class="metric-value">{metrics['level_1_centers']}</div>
-    </div>
-    """, unsafe_allow_html=True)
-
-with col_m4:
-    st.markdown(f"""
-    <div class="metric-container">
-        <div class="metric-label">Lvl 1 Trauma Ctr Beds</div>
-        <div class="metric-value">{metrics['level_1_beds']}</div>
-    </div>
-    """, unsafe_allow_html=True)
+with stage('metric_cards'):
+    col_m1, col_m2, col_m3, col_m4 = st.columns(4)
+
+    with col_m1:
+        st.markdown(f"""
+        <div class="metric-container">
+            <div class="metric-label">Total Hospitals</div>
+            <div class="metric-value">{metrics['hospitals']}</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col_m2:
+        st.markdown(f"""
+        <div class="metric-container">
+            <div class="metric-label">Hospitals w/ Helipads</div>
+            <div class="metric-value">{metrics['helipads']}</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col_m3:
+        st.markdown(f"""
+        <div class="metric-container">
+            <div class="metric-label">Lvl 1 Trauma Ctrs</div>
+            <div class="metric-value">{metrics['level_1_centers']}</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col_m4:
+        st.markdown(f"""
+        <div class="metric-container">
+            <div class="metric-label">Lvl 1 Trauma Ctr Beds</div>
+            <div class="metric-value">{metrics['level_1_beds']}</div>
+        </div>
+        """, unsafe_allow_html=True)
 
 st.markdown("---")  # Add another horizontal line after metrics
 
+# First paint is done; now import the geospatial stack (timed against the budget)
+with stage('geo_imports'):
+    import_times = load_geo_stack()
+from trauma_access import api
+
+with st.sidebar:
+    st.caption(f"Geospatial imports: {import_times['total']:.2f} s (budget {import_times['budget']:.1f} s)")
+
+# Data loading and distance computation live in trauma_access.api (cached
+# process-wide, shared with the other dashboards and batch jobs)
+with stage('hospitals'):
+    trauma = api.state_hospitals(state)
+
+# What-if scenario: edits are kept per session and applied incrementally (only
+# the tracts whose nearest facility changes are recomputed)
+with st.sidebar:
+    scenario_mode = st.toggle('What-if scenario', help='Open, close or move trauma centers and see the effect')
+
+scenario = None
+if scenario_mode:
+    scenario = st.session_state.get('scenario')
+    if scenario is None or scenario.state != state:
+        scenario = st.session_state['scenario'] = api.new_scenario(state)
+
+    with st.sidebar.expander('Edit scenario', expanded=True):
+        lon0, lat0, _ = view_for(api.state_map_points(state))
+        site_lat = st.number_input('Latitude', value=round(lat0, 4), format='%.4f')
+        site_lon = st.number_input('Longitude', value=round(lon0, 4), format='%.4f')
+        site_name = st.text_input('Name', 'New trauma center')
+        site_level = st.selectbox('Trauma level', (1, 2, 3, 4, 5))
+        if st.button('Open a trauma center here'):
+            with stage('scenario_update', edit='add'):
+                scenario.add(site_lon, site_lat, site_name, site_level)
+
+        facilities = {i: n for i, n in zip(trauma['ID'], trauma['NAME']) if i not in scenario.removed}
+        facilities.update({i: site['NAME'] for i, site in scenario.added.items()})
+        target = st.selectbox('Hospital', options=list(facilities), format_func=facilities.get)
+        col_close, col_move = st.columns(2)
+        if col_close.button('Close') and target is not None:
+            with stage('scenario_update', edit='remove'):
+                scenario.remove(target)
+        if col_move.button('Move to position') and target is not None:
+            with stage('scenario_update', edit='move'):
+                scenario.move(target, site_lon, site_lat, name=facilities[target])
+        if st.button('Reset scenario'):
+            scenario = st.session_state['scenario'] = api.new_scenario(state)
+        st.caption(f"{len(scenario.edits)} edits, {int(scenario.changed().sum())} tracts changed")
+
 col1, col2 = st.columns(2)
 
 with st.container():
     with col1:
         st.subheader('Location of Trauma Hospitals')
-        st.map(trauma)
+        # Only coordinates and a few styled attributes go to the browser,
+        # and tracts are simplified
+        with stage('map'):
+            if scenario is not None:
+                choropleth = api.scenario_choropleth(scenario) if show_tracts else None
+                points = scenario.map_points(trauma)
+            else:
+                choropleth = api.state_choropleth(state) if show_tracts else None
+                points = api.state_map_points(state)
+            areas = api.state_service_areas(state) if show_areas else None
+            st.pydeck_chart(hospital_deck(points, choropleth=choropleth, service_areas=areas))
 
     with col2:
         st.subheader('Hospital Name and Address')
-        st.dataframe(trauma[['NAME', 'ADDRESS', 'CITY', 'STATE', 'ZIP']], height=500)
+        with stage('table'):
+            st.dataframe(trauma[['NAME', 'ADDRESS', 'CITY', 'STATE', 'ZIP']], height=500)
         
-        # Calculate distances for histogram
-        state_tracts = state_tracts.to_crs(6571)
-        trauma = trauma.to_crs(6571)
-        state_buffer = gpd.GeoDataFrame(geometry=state_tracts.dissolve().buffer(100000))
-        state_trauma = gpd.sjoin(trauma, state_buffer, how='inner')
-        tract_centroids = state_tracts.centroid
-        dist = tract_centroids.geometry.apply(lambda g: state_trauma.distance(g, align=False))
-        min_dist = dist.min(axis='columns') / 1000
-
-# Calculate statistics for reference lines
-mean_distance = min_dist.mean()
-median_distance = min_dist.median()
-max_distance = min_dist.max()
+        # Calculate distances for histogram (precomputed results when available)
+        with stage('distances', cache=api.state_distances):
+            min_dist = api.state_distances(state)['nearest_dist_km']
+        if scenario is not None:
+            min_dist = scenario.distances()['nearest_dist_km']
+
+# Travel-time mode for states with a local friction raster (the what-if
+# scenario works on straight-line distance only)
+measure = 'Straight-line distance'
+if scenario is None and has_cost_raster(state):
+    with st.sidebar:
+        measure = st.radio('Access measure', ('Straight-line distance', 'Travel time'), horizontal=True,
+                           help='Approximate travel time over the local friction raster')
+travel_min = None
+if measure == 'Travel time':
+    with stage('travel_times', cache=api._state_travel_times):
+        travel_min = pd.Series(api.state_travel_times(state))
+
+# Statistics for the reference lines, weighted by tract population when the
+# local population table exists (residents rather than polygons)
+weights = api.state_population(state)
+access = None
+if weights is not None:
+    access = access_summary(min_dist, weights) if scenario is not None else api.state_access(state)
+if access is not None:
+    mean_distance, median_distance, max_distance = access['mean'], access['median'], access['max']
+else:
+    mean_distance = min_dist.mean()
+    median_distance = min_dist.median()
+    max_distance = min_dist.max()
+
+# In travel-time mode the chart and statistic cards show minutes; the insights
+# below stay on straight-line distance
+shown, unit, label = min_dist, 'km', 'Distance'
+shown_stats = (mean_distance, median_distance, max_distance)
+if travel_min is not None:
+    shown, unit, label = travel_min, 'min', 'Travel Time'
+    travel_access = access_summary(travel_min, weights)
+    shown_stats = (travel_access['mean'], travel_access['median'], travel_access['max'])
 
 with st.container():
-    st.subheader('Min distance to trauma center from tract centroid')
-    
-    # Create the bar chart with matplotlib for better customization
-    fig, ax = plt.subplots(figsize=(12, 6))
-    
-    # Dynamic x-axis scaling based on actual data
-    # Add some padding (10% of range) to make the chart look better
-    x_min = 0
-    x_max = max_distance * 1.1  # Add 10% padding to max distance
-    
-    # Create dynamic bins based on the data range
-    # Use reasonable bin width (1 km for smaller ranges, adjust for larger ranges)
-    if x_max <= 20:
-        bin_width = 0.5  # 0.5 km bins for small ranges
-    elif x_max <= 50:
-        bin_width = 1    # 1 km bins for medium ranges
+    if travel_min is not None:
+        st.subheader('Approximate travel time to trauma center from tract centroid')
     else:
-        bin_width = 2    # 2 km bins for large ranges
-    
-    bins = np.arange(x_min, x_max + bin_width, bin_width)
-    
-    # Create the histogram
-    ax.hist(min_dist, bins=bins, alpha=0.7, color='steelblue', edgecolor='black', linewidth=0.5)
-    
-    # Add mean and median reference lines
-    ax.axvline(mean_distance, color='red', linestyle='--', linewidth=2, alpha=0.8)
-    ax.axvline(median_distance, color='orange', linestyle='--', linewidth=2, alpha=0.8)
+        st.subheader('Min distance to trauma center from tract centroid')
     
-    # Add labels for the reference lines
-    # Position labels dynamically based on chart dimensions
-    y_max = ax.get_ylim()[1]
-    label_offset = x_max * 0.01  # 1% of x-range for label positioning
-    
-    ax.text(mean_distance + label_offset, y_max * 0.9, 
-            f'Mean: {mean_distance:.1f} km', 
-            rotation=0, color='red', fontweight='bold', fontsize=10)
-    ax.text(median_distance + label_offset, y_max * 0.8, 
-            f'Median: {median_distance:.1f} km', 
-            rotation=0, color='orange', fontweight='bold', fontsize=10)
-    
-    # Customize the chart
-    ax.set_xlabel('Distance (km)', fontsize=12)
-    ax.set_ylabel('Number of Census Tracts', fontsize=12)
-    ax.set_title(f'Distribution of Minimum Distance to Trauma Centers - {state}', fontsize=14, fontweight='bold')
-    ax.grid(True, alpha=0.3)
-    ax.set_xlim(x_min, x_max)  # Dynamic x-axis limit based on data
-    
-    # Display the plot in Streamlit
-    st.pyplot(fig)
+    # Binned counts and the rendered chart are cached per (state, data version),
+    # so reruns from other widgets don't rebuild the figure
+    data_version = api.dataset_version(population=weights is not None)
+    if travel_min is not None:
+        data_version = f'{data_version}-c{cost_raster_version(state)}'
+    with stage('figure', chart=chart_style):
+        if scenario is not None:
+            # Scenario charts change with every edit, so they bypass the caches
+            hist = bin_distances(min_dist, weights=weights)
+            if chart_style == 'Interactive':
+                st.altair_chart(histogram_chart(hist, state), use_container_width=True)
+            else:
+                st.image(render_histogram(hist, state), use_container_width=True)
+        elif chart_style == 'Interactive':
+            hist = distance_histogram(state, data_version, shown, weights=weights, unit=unit)
+            st.altair_chart(histogram_chart(hist, state), use_container_width=True)
+        else:
+            st.image(histogram_image(state, data_version, shown, weights=weights, unit=unit),
+                     use_container_width=True)
     
     # Display the statistics below the chart with enhanced styling
-    st.markdown(f"# 📈 Distance Statistics for {state}")
-    col_s1, col_s2, col_s3 = st.columns(3)
-    with col_s1:
-        st.markdown(f"""
-        <div class="metric-container">
-            <div class="stat-label">Mean Distance</div>
-            <div class="stat-value">{mean_distance:.1f} km</div>
-        </div>
-        """, unsafe_allow_html=True)
-    with col_s2:
-        st.markdown(f"""
-        <div class="metric-container">
-            <div class="stat-label">Median Distance</div>
-            <div class="stat-value">{median_distance:.1f} km</div>
-        </div>
-        """, unsafe_allow_html=True)
-    with col_s3:
-        st.markdown(f"""
-        <div class="metric-container">
-            <div class="stat-label">Maximum Distance</div>
-            <div class="stat-value">{max_distance:.1f} km</div>
-        </div>
-        """, unsafe_allow_html=True)
+    st.markdown(f"# 📈 {label} Statistics for {state}")
+    if access is not None:
+        st.caption('Weighted by tract population, so these describe residents rather than census tracts.')
+    if travel_min is not None:
+        st.caption('Minimum cost over the friction raster from each tract centroid, in minutes; '
+                   'tracts the raster cannot reach are left out.')
+    with stage('stat_cards'):
+        col_s1, col_s2, col_s3 = st.columns(3)
+        with col_s1:
+            st.markdown(f"""
+            <div class="metric-container">
+                <div class="stat-label">Mean {label}</div>
+                <div class="stat-value">{shown_stats[0]:.1f} {unit}</div>
+            </div>
+            """, unsafe_allow_html=True)
+        with col_s2:
+            st.markdown(f"""
+            <div class="metric-container">
+                <div class="stat-label">Median {label}</div>
+                <div class="stat-value">{shown_stats[1]:.1f} {unit}</div>
+            </div>
+            """, unsafe_allow_html=True)
+        with col_s3:
+            st.markdown(f"""
+            <div class="metric-container">
+                <div class="stat-label">Maximum {label}</div>
+                <div class="stat-value">{shown_stats[2]:.1f} {unit}</div>
+            </div>
+            """, unsafe_allow_html=True)
 
     # Add collapsible insights section with larger title
     st.markdown("---")
@@ -328,11 +379,44 @@ with st.container():
         st.markdown('<div class="insights-content">', unsafe_allow_html=True)
         st.markdown("### What do these numbers tell us about trauma care access?")
         
-        insights = generate_insights(state, mean_distance, median_distance, max_distance, metrics)
+        with stage('insights'):
+            insights = generate_insights(state, mean_distance, median_distance, max_distance, metrics, access=access)
         
         for insight in insights:
             st.markdown(f'<div class="insights-bullet">• {insight}</div>', unsafe_allow_html=True)
         
         st.markdown("---")
         st.markdown("*These insights are based on distance analysis and hospital infrastructure data. Actual emergency response times may vary due to traffic, weather, and other factors.*")
-        st.markdown('</div>', unsafe_allow_html=True)
\ No newline at end of file
+        st.markdown('</div>', unsafe_allow_html=True)
+
+    # Catchments: the tracts (and residents) each hospital is nearest to
+    st.markdown("## 🏥 Hospital Catchment Areas")
+    with st.expander("Click to view the tracts, population and beds each hospital serves", expanded=False):
+        with stage('catchments'):
+            catchments = api.scenario_catchments(scenario) if scenario is not None else api.state_catchments(state)
+        st.dataframe(
+            catchments.drop(columns=['ID']), hide_index=True,
+            column_config={
+                'TRAUMA_LEVEL': st.column_config.NumberColumn('Level'),
+                'BEDS': st.column_config.NumberColumn('Beds'),
+                'population': st.column_config.NumberColumn('Population served', format='%d'),
+                'mean_dist_km': st.column_config.NumberColumn('Mean distance (km)', format='%.1f'),
+                'max_dist_km': st.column_config.NumberColumn('Max distance (km)', format='%.1f'),
+                'beds_per_100k': st.column_config.NumberColumn('Beds per 100k served', format='%.1f'),
+            },
+        )
+        st.caption('Each tract is assigned to its nearest trauma hospital, including hospitals across the state line. Beds per 100k needs the population table; -999 beds (not reported) are left blank.')
+
+finish_run()
+
+# With TRAUMA_PREFETCH=1, warm the states most likely to be picked next
+prefetch_next(state)
+
+if dev_panel:
+    with st.sidebar.expander('Developer: stage timings', expanded=True):
+        st.caption(f"Run {run.run_id} · {state} · total {run.total_ms:.0f} ms")
+        st.dataframe(run.stages, hide_index=True)
+        st.caption('All runs in this server process')
+        st.dataframe(stage_summary(), hide_index=True)
+        st.caption('In-memory caches')
+        st.dataframe(cache_report(), hide_index=True)
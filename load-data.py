@@ -1,4 +1,4 @@
 # quick file for loading data into Session window for review/testing
-import geopandas as gpd
+from trauma_access import read_trauma
 
-trauma = gpd.read_file('trauma.geojson')
\ No newline at end of file
+trauma = read_trauma()
\ No newline at end of file
@@ -0,0 +1,46 @@
+# Shared fixtures for the trauma_access tests
+# The tests build small synthetic hospitals and tracts in ANALYSIS_CRS, so they
+# need neither the tract store nor the network.
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def lonlat_points():
+    """Function giving n random points (as lon, lat arrays) around central Iowa."""
+    def make(n, seed):
+        rng = np.random.default_rng(seed)
+        return rng.uniform(-94.5, -92.5, n), rng.uniform(41.5, 42.5, n)
+    return make
+
+
+@pytest.fixture
+def facility_index(lonlat_points):
+    """NearestFacilityIndex over 40 synthetic hospitals H0..H39."""
+    import geopandas as gpd
+
+    from trauma_access.nearest import NearestFacilityIndex
+    from trauma_access.tracts import ANALYSIS_CRS
+
+    lon, lat = lonlat_points(40, seed=1)
+    hospitals = gpd.GeoDataFrame({'ID': [f'H{i}' for i in range(40)]},
+                                 geometry=gpd.points_from_xy(lon, lat), crs='EPSG:4326')
+    return NearestFacilityIndex(hospitals.to_crs(ANALYSIS_CRS))
+
+
+@pytest.fixture
+def centroids(lonlat_points):
+    """GEOIDs and 500 synthetic tract centroids in ANALYSIS_CRS."""
+    import geopandas as gpd
+
+    from trauma_access.tracts import ANALYSIS_CRS
+
+    lon, lat = lonlat_points(500, seed=2)
+    points = gpd.GeoSeries(gpd.points_from_xy(lon, lat), crs='EPSG:4326').to_crs(ANALYSIS_CRS)
+    return np.array([f'19{i:09d}' for i in range(500)]), points.to_numpy()
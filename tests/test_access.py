@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from trauma_access.access import BIN_EDGES_KM, PERCENTILES, THRESHOLDS_KM, access_summary
+
+
+def reference(distance, weights):
+    """access_summary() values computed tract by tract."""
+    total = weights.sum()
+    percentiles = {}
+    for p in PERCENTILES:
+        # Smallest distance whose population at or below it reaches p%
+        percentiles[p] = min(d for d in distance if weights[distance <= d].sum() >= p / 100 * total)
+    share_within = {km: weights[distance <= km].sum() / total for km in THRESHOLDS_KM}
+    return {'mean': (distance * weights).sum() / total, 'max': distance.max(),
+            'percentiles': percentiles, 'share_within': share_within}
+
+
+@pytest.fixture
+def tracts():
+    rng = np.random.default_rng(3)
+    distance = rng.gamma(2.0, 15.0, 300).round(1) + 12  # nearest is past the 10 km threshold
+    weights = rng.integers(1, 5000, 300).astype(float)
+    return distance, weights
+
+
+def test_matches_reference(tracts):
+    distance, weights = tracts
+    summary = access_summary(distance, weights)
+    expected = reference(distance, weights)
+
+    assert summary['weighted'] and summary['tracts'] == 300 and summary['total'] == weights.sum()
+    assert summary['mean'] == pytest.approx(expected['mean'])
+    assert summary['max'] == expected['max']
+    assert summary['percentiles'] == expected['percentiles']
+    assert summary['median'] == expected['percentiles'][50]
+    assert summary['share_within'] == pytest.approx(expected['share_within'])
+    assert summary['share_within'][10] == 0
+    assert summary['counts'].sum() == pytest.approx(weights.sum())
+    assert summary['curve'][-1] == pytest.approx(1.0)
+
+
+def test_unweighted_counts_tracts(tracts):
+    distance, _ = tracts
+    summary = access_summary(distance)
+    expected = reference(distance, np.ones_like(distance))
+
+    assert not summary['weighted'] and summary['total'] == 300
+    assert summary['mean'] == pytest.approx(distance.mean())
+    assert summary['percentiles'] == expected['percentiles']
+    assert summary['share_within'] == pytest.approx(expected['share_within'])
+
+
+def test_skips_missing_distances_and_empty_tracts(tracts):
+    distance, weights = tracts
+    padded_distance = np.concatenate([distance, [np.nan, np.nan, 1.0, 2.0, 3.0]])
+    padded_weights = np.concatenate([weights, [500.0, np.nan, 0.0, np.nan, -1.0]])
+    summary = access_summary(padded_distance, padded_weights)
+    expected = access_summary(distance, weights)
+
+    assert summary['tracts'] == 300 and summary['total'] == expected['total']
+    assert summary['mean'] == pytest.approx(expected['mean'])
+    assert summary['percentiles'] == expected['percentiles']
+    assert summary['share_within'] == pytest.approx(expected['share_within'])
+    np.testing.assert_allclose(summary['counts'], expected['counts'])
+
+
+def test_distances_past_the_last_bin_land_in_it():
+    summary = access_summary([2.0, 900.0], [1.0, 3.0])
+    assert summary['counts'][0] == 1 and summary['counts'][-1] == 3
+    assert len(summary['counts']) == len(BIN_EDGES_KM) - 1
+    assert summary['max'] == 900.0
+
+
+@pytest.mark.parametrize('distance, weights', [
+    ([], None),
+    ([np.nan, np.nan], None),
+    ([5.0, 20.0], [0.0, np.nan]),
+])
+def test_nothing_to_summarize_is_nan(distance, weights):
+    summary = access_summary(distance, weights)
+
+    assert summary['tracts'] == 0 and summary['total'] == 0
+    assert np.isnan(summary['mean']) and np.isnan(summary['max']) and np.isnan(summary['median'])
+    assert all(np.isnan(v) for v in summary['percentiles'].values())
+    assert all(np.isnan(v) for v in summary['share_within'].values())
+    assert not summary['counts'].any() and not summary['curve'].any()
@@ -0,0 +1,45 @@
+import pandas as pd
+import pytest
+
+from trauma_access.hospitals import parse_trauma, trauma_columns
+
+# Every distinct TRAUMA string in trauma.geojson: (level, adult, pediatric)
+TRAUMA_STRINGS = [
+    ('LEVEL I', (1, True, False)),
+    ('LEVEL I ADULT', (1, True, False)),
+    ('LEVEL I ADULT, LEVEL I PEDIATRIC', (1, True, True)),
+    ('LEVEL I ADULT, LEVEL II PEDIATRIC', (1, True, True)),
+    ('LEVEL I PEDIATRIC', (1, False, True)),
+    ('LEVEL I PEDIATRIC REHAB', (0, False, False)),
+    ('LEVEL I, LEVEL I PEDIATRIC', (1, True, True)),
+    ('LEVEL I, LEVEL II PEDIATRIC', (1, True, True)),
+    ('LEVEL II', (2, True, False)),
+    ('LEVEL II / PEDIATRIC', (2, True, True)),  # PEDIATRIC inherits Level II
+    ('LEVEL II ADULT', (2, True, False)),
+    ('LEVEL II ADULT, LEVEL II PEDIATRIC', (2, True, True)),
+    ('LEVEL II PEDIATRIC', (2, False, True)),
+    ('LEVEL II REHAB', (0, False, False)),
+    ('LEVEL II, LEVEL II PEDIATRIC', (2, True, True)),
+    ('LEVEL II, LEVEL III PEDIATRIC, LEVEL II REHAB', (2, True, True)),
+    ('RTC', (0, False, False)),
+    ('RTH', (0, False, False)),
+]
+
+
+@pytest.mark.parametrize('value, expected', TRAUMA_STRINGS)
+def test_parse_trauma(value, expected):
+    assert parse_trauma(value) == expected
+
+
+@pytest.mark.parametrize('value', [None, float('nan'), ''])
+def test_parse_trauma_missing(value):
+    assert parse_trauma(value) == (0, False, False)
+
+
+def test_trauma_columns_maps_each_row():
+    values = pd.Series(['LEVEL II', None, 'LEVEL I PEDIATRIC', 'LEVEL II', 'LEVEL II REHAB'], index=[5, 6, 7, 8, 9])
+    columns = trauma_columns(values)
+    assert columns.index.tolist() == [5, 6, 7, 8, 9]
+    assert columns['TRAUMA_LEVEL'].tolist() == [2, 0, 1, 2, 0]
+    assert columns['TRAUMA_ADULT'].tolist() == [True, False, False, True, False]
+    assert columns['TRAUMA_PEDIATRIC'].tolist() == [False, False, True, False, False]
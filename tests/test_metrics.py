@@ -0,0 +1,22 @@
+import pandas as pd
+
+from trauma_access.hospitals import normalize_hospitals
+from trauma_access.metrics import METRIC_COLUMNS, metrics_table
+
+
+def test_metrics_table_counts():
+    raw = pd.DataFrame({
+        'STATE': ['AK', 'AK', 'AK', 'AK', 'RI'],
+        'HELIPAD': ['Y', 'N', 'Y', 'Y', 'N'],
+        'TRAUMA': ['LEVEL I', 'LEVEL I ADULT', 'LEVEL II', None, 'LEVEL III'],
+        'BEDS': [300, -999, 120, 50, 80],
+    })
+    table = metrics_table(normalize_hospitals(raw))
+
+    assert list(table.columns) == METRIC_COLUMNS
+    assert table.loc['AK'].to_dict() == {
+        'hospitals': 4, 'helipads': 3,
+        'level_1_centers': 2,  # LEVEL II is not a Level I center
+        'level_1_beds': 300,  # -999 (not reported) counts as 0
+    }
+    assert table.loc['RI'].to_dict() == {'hospitals': 1, 'helipads': 0, 'level_1_centers': 0, 'level_1_beds': 0}
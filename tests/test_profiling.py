@@ -0,0 +1,37 @@
+from trauma_access.cache import LRUCache, memoize
+from trauma_access.profiling import finish_run, stage, start_run
+
+_cache = LRUCache(8, name='test_profiling')
+
+
+@memoize(_cache)
+def inner(x):
+    return x
+
+
+@memoize(_cache)
+def outer(x):
+    return inner(x) + 1
+
+
+def test_stage_reports_the_outer_lookup():
+    inner(1)  # the nested call will hit
+    run = start_run('test')
+    try:
+        with stage('first', cache=outer):
+            outer(1)
+        with stage('second', cache=outer):
+            outer(1)
+    finally:
+        finish_run()
+    assert [s['cache'] for s in run.stages] == ['miss', 'hit']
+
+
+def test_stage_ignores_objects_without_last_hit():
+    run = start_run('test')
+    try:
+        with stage('plain', cache=len):
+            pass
+    finally:
+        finish_run()
+    assert 'cache' not in run.stages[0]
@@ -0,0 +1,83 @@
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pytest
+import shapely
+
+from trauma_access import refresh
+from trauma_access.hospitals import in_service
+from trauma_access.nearest import NearestFacilityIndex
+from trauma_access.precompute import compute_state_distances
+from trauma_access.results import results_path
+from trauma_access.tracts import ANALYSIS_CRS
+
+
+@pytest.fixture
+def hospitals(lonlat_points):
+    lon, lat = lonlat_points(40, seed=1)
+    return gpd.GeoDataFrame({'ID': [f'H{i}' for i in range(40)], 'STATUS': 'OPEN'},
+                            geometry=gpd.points_from_xy(lon, lat), crs='EPSG:4326').to_crs(ANALYSIS_CRS)
+
+
+@pytest.fixture
+def state(centroids, monkeypatch):
+    """Synthetic state 'ZZ': 1 km square tracts around the centroids, served
+    to refresh in place of the tract store."""
+    geoids, points = centroids
+    tracts = gpd.GeoDataFrame({'GEOID': geoids}, geometry=shapely.buffer(points, 500, cap_style='square'),
+                              crs=ANALYSIS_CRS)
+    hull = shapely.convex_hull(shapely.union_all(tracts.geometry.values))
+    outline = {'outline': hull, 'envelope': hull.buffer(100000)}
+    monkeypatch.setattr(refresh, 'load_tracts', lambda *args, **kwargs: tracts)
+    monkeypatch.setattr(refresh, 'load_state_outline', lambda *args, **kwargs: outline)
+    return tracts, outline
+
+
+def publish(tmp_path, version, result):
+    (tmp_path / version).mkdir()
+    result.to_parquet(results_path('ZZ', version, str(tmp_path)), index=False)
+
+
+def refreshed(tmp_path, old, new, state):
+    tracts, outline = state
+    old_index, new_index = NearestFacilityIndex(in_service(old)), NearestFacilityIndex(in_service(new))
+    publish(tmp_path, 'old', compute_state_distances(tracts, outline, old_index))
+    changes = refresh.diff_facilities(old_index.frame(), new_index.frame())
+    result = refresh.refresh_state('ZZ', 'old', changes, results_dir=str(tmp_path), index=new_index)
+    return result, changes, compute_state_distances(tracts, outline, new_index)
+
+
+def assert_same(result, full):
+    np.testing.assert_allclose(result['nearest_dist_km'].to_numpy(), full['nearest_dist_km'].to_numpy())
+    assert (result['nearest_id'].to_numpy() == full['nearest_id'].to_numpy()).all()
+
+
+def test_refresh_matches_full_recompute(tmp_path, hospitals, state):
+    new = hospitals.drop(index=[0, 7]).copy()
+    new.loc[3, 'geometry'] = shapely.Point(new.loc[3, 'geometry'].x + 20000, new.loc[3, 'geometry'].y)
+    extra = gpd.GeoDataFrame({'ID': ['N1'], 'STATUS': 'OPEN'}, crs=ANALYSIS_CRS,
+                             geometry=[shapely.centroid(state[1]['outline'])])
+    new = pd.concat([new, extra], ignore_index=True)
+
+    (result, recomputed, unchanged), changes, full = refreshed(tmp_path, hospitals, new, state)
+    assert changes['added'] == ['N1'] and sorted(changes['removed']) == ['H0', 'H7'] and changes['moved'] == ['H3']
+    assert not unchanged and 0 < recomputed < len(full)
+    assert_same(result, full)
+
+
+def test_closed_hospital_counts_as_removed(tmp_path, hospitals, state):
+    tracts, outline = state
+    busiest = compute_state_distances(tracts, outline, NearestFacilityIndex(hospitals))['nearest_id'].mode()[0]
+    new = hospitals.copy()
+    new.loc[new['ID'] == busiest, 'STATUS'] = 'CLOSED'
+
+    (result, recomputed, _), changes, full = refreshed(tmp_path, hospitals, new, state)
+    assert changes['removed'] == [busiest]
+    assert recomputed > 0 and busiest not in set(result['nearest_id'])
+    assert_same(result, full)
+
+
+def test_untouched_state_is_carried_over(tmp_path, hospitals, state):
+    (result, recomputed, unchanged), _, full = refreshed(tmp_path, hospitals, hospitals.copy(), state)
+    assert unchanged and recomputed == 0
+    assert_same(result, full)
@@ -0,0 +1,121 @@
+import types
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pytest
+
+from trauma_access import api
+from trauma_access.hospitals import MISSING
+from trauma_access.scenario import Scenario
+
+
+def full_query(index, centroids):
+    nearest = index.query(gpd.GeoSeries(centroids, crs=index.crs))
+    return nearest['distance'].to_numpy() / 1000, nearest[index.id_column].to_numpy()
+
+
+@pytest.fixture
+def base(facility_index, centroids):
+    geoids, points = centroids
+    km, ids = full_query(facility_index, points)
+    return pd.DataFrame({'GEOID': geoids, 'nearest_dist_km': km, 'nearest_id': ids})
+
+
+def check_against_full_query(scenario):
+    km, ids = full_query(scenario.active_index(), scenario.centroids)
+    result = scenario.distances()
+    np.testing.assert_allclose(result['nearest_dist_km'].to_numpy(), km)
+    assert (result['nearest_id'].to_numpy() == ids).all()
+
+
+def test_edits_match_full_query(facility_index, centroids, base):
+    geoids, points = centroids
+    scenario = Scenario('IA', geoids, points, base, facility_index)
+
+    site = scenario.add(-93.5, 42.0, 'Site A')
+    check_against_full_query(scenario)
+    busiest = base['nearest_id'].value_counts().index[0]
+    assert scenario.remove(busiest) > 0
+    check_against_full_query(scenario)
+    scenario.move('H3', -94.2, 41.6)
+    check_against_full_query(scenario)
+    scenario.move(site, -92.7, 42.4)
+    check_against_full_query(scenario)
+    scenario.remove(site)
+    check_against_full_query(scenario)
+
+
+def test_rows_follow_distances_order(facility_index, centroids, base):
+    geoids, points = centroids
+    shuffled = base.sample(frac=1, random_state=0).reset_index(drop=True)
+    scenario = Scenario('IA', geoids, points, shuffled, facility_index)
+    scenario.add(-93.0, 42.2)
+    check_against_full_query(scenario)
+    assert (scenario.distances()['GEOID'].to_numpy() == shuffled['GEOID'].to_numpy()).all()
+
+
+def test_shared_distances_are_not_modified(facility_index, centroids, base):
+    # `base` stands in for the cached state_distances() frame every session shares
+    geoids, points = centroids
+    snapshot = base.copy(deep=True)
+    scenario = Scenario('IA', geoids, points, base, facility_index)
+    scenario.add(-93.5, 42.0)
+    scenario.remove(base['nearest_id'].iloc[0])
+    scenario.move('H5', -93.9, 41.9)
+
+    pd.testing.assert_frame_equal(base, snapshot)
+    for column in ('nearest_dist_km', 'nearest_id'):
+        assert not np.shares_memory(base[column].to_numpy(), scenario.distances()[column].to_numpy())
+    assert not np.shares_memory(base['nearest_id'].to_numpy(), scenario.nearest_id)
+    assert not np.shares_memory(base['nearest_dist_km'].to_numpy(), scenario.base_km)
+
+
+def test_move_is_one_edit(facility_index, centroids, base):
+    geoids, points = centroids
+    scenario = Scenario('IA', geoids, points, base, facility_index)
+    site = scenario.add(-93.5, 42.0)
+    scenario.remove('H1')
+    scenario.move(site, -93.0, 41.8)
+    assert [edit[0] for edit in scenario.edits] == ['add', 'remove', 'move']
+    assert scenario.changed().any()
+
+
+def test_moved_hospital_keeps_its_attributes(facility_index, centroids, base):
+    geoids, points = centroids
+    facilities = pd.DataFrame({'NAME': [f'Hospital {i}' for i in range(40)], 'TRAUMA_LEVEL': 3, 'BEDS': 150},
+                              index=[f'H{i}' for i in range(40)])
+    facilities.loc['H4', 'BEDS'] = -999
+    scenario = Scenario('IA', geoids, points, base, facility_index, facilities)
+    scenario.move('H3', -94.2, 41.6)
+    scenario.move('H3', -94.0, 41.7)
+    scenario.move('H4', -93.1, 42.1)
+
+    site = scenario.added['H3']
+    assert (site['NAME'], site['level'], site['beds']) == ('Hospital 3', 3, 150)
+    assert scenario.edits[0] == ('move', 'H3', -94.2, 41.6, 3)
+
+    trauma = pd.DataFrame({'ID': facilities.index, 'NAME': facilities['NAME'], 'TRAUMA_LEVEL': 3, 'BEDS': 150,
+                           'lon': -93.0, 'lat': 42.0})
+    points = scenario.map_points(trauma).set_index('NAME')
+    assert len(points) == 40
+    assert points.loc['Hospital 3', ['level', 'beds']].tolist() == [3, 150]
+    assert points.loc['Hospital 3', 'lon'] == np.float32(-94.0)
+    assert points.loc['Hospital 4', 'beds'] == 0  # -999 (not reported) draws as 0
+
+
+def test_catchments_keep_moved_hospitals(facility_index, centroids, base, monkeypatch):
+    geoids, points = centroids
+    store = pd.DataFrame({'ID': [f'H{i}' for i in range(40)], 'NAME': [f'Hospital {i}' for i in range(40)],
+                          'STATE': 'IA', 'TRAUMA_LEVEL': 2, 'BEDS': 200})
+    monkeypatch.setattr(api, 'get_hospital_store', lambda: types.SimpleNamespace(data=store))
+    monkeypatch.setattr(api, 'state_population', lambda *args, **kwargs: None)
+    scenario = Scenario('IA', geoids, points, base, facility_index, store.set_index('ID'))
+    scenario.move('H3', -94.2, 41.6)
+    site = scenario.add(-93.5, 42.0, 'Site A', level=1)
+    scenario.remove('H7')
+
+    table = api.scenario_catchments(scenario).set_index('ID')
+    assert table.loc['H3', ['TRAUMA_LEVEL', 'BEDS']].tolist() == [2, 200]
+    assert table.loc[site, ['TRAUMA_LEVEL', 'BEDS']].tolist() == [1, MISSING]
+    assert 'H7' not in table.index and table.index.is_unique
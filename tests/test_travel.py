@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+import shapely
+
+from trauma_access.travel import cost_surface, raster_cells, travel_times
+
+
+@pytest.fixture
+def friction():
+    rng = np.random.default_rng(0)
+    friction = rng.uniform(0.5, 3.0, (300, 260))
+    friction[rng.random(friction.shape) < 0.1] = np.nan  # scattered impassable cells
+    friction[150, 100:200] = np.inf  # a wall with a gap past column 200
+    return friction
+
+
+@pytest.fixture
+def seeds():
+    rng = np.random.default_rng(1)
+    return rng.integers(0, 300, 12), rng.integers(0, 260, 12)
+
+
+@pytest.mark.parametrize('tile', [32, 64, 100])
+def test_tiled_matches_untiled(friction, seeds, tile):
+    whole = cost_surface(friction, seeds, 1000, tile=10 ** 6)
+    tiled = cost_surface(friction, seeds, 1000, tile=tile)
+    assert (np.isfinite(whole) == np.isfinite(tiled)).all()
+    finite = np.isfinite(whole)
+    np.testing.assert_allclose(tiled[finite], whole[finite], atol=1e-6)
+
+
+def test_seed_on_tile_edge(friction):
+    # A seed on a shared row/column must reach both tiles it belongs to
+    seeds = (np.array([64]), np.array([64]))
+    whole = cost_surface(friction, seeds, 1000, tile=10 ** 6)
+    tiled = cost_surface(friction, seeds, 1000, tile=64)
+    finite = np.isfinite(whole)
+    np.testing.assert_allclose(tiled[finite], whole[finite], atol=1e-6)
+
+
+def test_uniform_friction_is_close_to_straight_line():
+    # 1 min/km: minutes equal km, give or take the 8-connected grid's detours (< 8.3%)
+    surface = cost_surface(np.ones((201, 201)), (np.array([100]), np.array([100])), 1000)
+    rows, cols = np.indices(surface.shape)
+    km = np.hypot(rows - 100, cols - 100)
+    ratio = surface[km > 0] / km[km > 0]
+    assert ratio.min() >= 1 - 1e-9 and ratio.max() <= 1.083
+
+
+def test_travel_times_sample_centroid_cells():
+    raster = {'friction': np.ones((50, 50)), 'origin': (0.0, 50000.0), 'cell_size': 1000.0}
+    facilities = shapely.points([[500, 49500]])  # top-left cell
+    centroids = shapely.points([[500, 49500], [10500, 49500], [-500, 100], [49500, 500]])
+    minutes = travel_times(raster, facilities, centroids)
+    assert minutes[0] == 0 and minutes[1] == pytest.approx(10)
+    assert np.isnan(minutes[2])  # off the grid
+    assert minutes[3] == pytest.approx(49 * np.sqrt(2))
+
+    rows, cols, inside = raster_cells([500, -500], [49500, 100], raster['origin'], 1000.0, (50, 50))
+    assert rows[0] == 0 and cols[0] == 0 and inside.tolist() == [True, False]
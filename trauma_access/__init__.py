@@ -0,0 +1,58 @@
+# Shared library for the trauma hospital dashboards (app02/app03/app04) and batch jobs
+# trauma_access.api is the stable entry point: pure per-state compute functions
+# backed by a process-wide cache.
+# Names are resolved lazily (PEP 562), so `from trauma_access import state_metrics`
+# does not pull in geopandas/shapely/matplotlib; each submodule is imported the
+# first time one of its names is used.
+
+import importlib
+
+_EXPORTS = {
+    'nearest': ['NearestFacilityIndex', 'national_index', 'nearest_facility'],
+    'hospitals': ['HospitalStore', 'get_hospital_store', 'read_trauma', 'read_trauma_table'],
+    'tracts': ['ANALYSIS_CRS', 'DISPLAY_CRS', 'ingest_tracts', 'load_state_outline', 'load_tracts'],
+    'results': ['load_results', 'results_version'],
+    'precompute': ['compute_state_distances', 'run_all'],
+    'metrics': ['get_metrics_table', 'list_states', 'metrics_table', 'state_metrics'],
+    'charts': [
+        'bin_distances', 'comparison_chart', 'distance_histogram', 'histogram_chart', 'histogram_image',
+        'render_histogram',
+    ],
+    'maps': ['distance_choropleth', 'hospital_deck', 'hospital_points', 'view_for'],
+    'population': ['ingest_population', 'load_population', 'population_version'],
+    'access': ['access_summary'],
+    'summaries': ['build_summaries', 'distribution_frame', 'load_summaries', 'ranking_table'],
+    'scenario': ['Scenario'],
+    'catchments': ['catchment_table', 'service_areas'],
+    'travel': [
+        'cost_raster_version', 'cost_surface', 'has_cost_raster', 'ingest_cost_raster', 'load_cost_raster',
+        'travel_times',
+    ],
+    'startup': ['import_report', 'load_geo_stack'],
+    'insights': ['generate_insights'],
+    'cache': ['LRUCache', 'cache_report', 'estimate_size', 'memoize'],
+    'diskcache': ['DiskCache', 'get_disk_cache'],
+    'prefetch': ['Prefetcher', 'get_prefetcher', 'prefetch_next'],
+    'profiling': ['finish_run', 'stage', 'stage_summary', 'start_run'],
+    'api': [
+        'dataset_version', 'distance_stats', 'new_scenario', 'scenario_catchments',
+        'scenario_choropleth', 'state_access', 'state_catchments', 'state_centroids',
+        'state_choropleth', 'state_distances', 'state_hospitals', 'state_insights',
+        'state_map_points', 'state_population', 'state_service_areas', 'state_summaries',
+        'state_tracts', 'state_travel_times', 'warm',
+    ],
+}
+_MODULE_OF = {name: module for module, names in _EXPORTS.items() for name in names}
+__all__ = sorted(_MODULE_OF)
+
+
+def __getattr__(name):
+    if name not in _MODULE_OF:
+        raise AttributeError(f"module 'trauma_access' has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'trauma_access.{_MODULE_OF[name]}'), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,155 @@
+# Command line entry point: python -m trauma_access <command> ...
+
+import argparse
+
+from trauma_access.precompute import run_all
+from trauma_access.tracts import STATE_FIPS, TRACT_YEAR, ingest_tracts
+
+
+def cmd_ingest_tracts(args):
+    states = sorted(STATE_FIPS) if args.all else args.states
+    for state in states:
+        tracts = ingest_tracts(state, year=args.year, source=args.source)
+        print(f'{state}: {len(tracts)} tracts')
+
+
+def cmd_ingest_population(args):
+    from trauma_access.population import ingest_population
+
+    table = ingest_population(args.source, year=args.year)
+    print(f"{len(table)} tracts, population {table['population'].sum():,}")
+
+
+def cmd_ingest_cost(args):
+    from trauma_access.travel import ingest_cost_raster
+
+    for state in args.states:
+        friction = ingest_cost_raster(state, args.source, cell_size=args.cell_size, scale=args.scale)
+        print(f'{state}: {friction.shape[1]} x {friction.shape[0]} cells of {args.cell_size:g} m')
+
+
+def cmd_precompute(args):
+    manifest = run_all(states=args.states or None, workers=args.workers, year=args.year)
+    seconds = sum(r['seconds'] for r in manifest['states'].values())
+    print(f"{manifest['version']}: {len(manifest['states'])} states, {seconds:.1f} worker-seconds")
+    for state, error in manifest['failed'].items():
+        print(f'{state} failed: {error}')
+
+
+def cmd_refresh(args):
+    from trauma_access.refresh import refresh
+
+    manifest = refresh(old_version=args.base, year=args.year)
+    if manifest is None:
+        raise SystemExit('no previous version with a facility list; run `python -m trauma_access precompute`')
+    changes = manifest['changes']
+    recomputed = sum(r['recomputed'] for r in manifest['states'].values())
+    print(f"{manifest['refreshed_from']} -> {manifest['version']}: {len(changes['added'])} added, "
+          f"{len(changes['removed'])} removed, {len(changes['moved'])} moved")
+    print(f"{recomputed} tracts recomputed in {sum(r['recomputed'] > 0 for r in manifest['states'].values())} "
+          f"of {len(manifest['states'])} states, {manifest['seconds']:.1f}s")
+    for state, error in manifest['failed'].items():
+        print(f'{state} failed: {error}')
+
+
+def cmd_summarize(args):
+    from trauma_access.summaries import build_summaries
+
+    table = build_summaries(args.version, year=args.year)
+    print(f"{len(table)} states summarized ({'population' if table['weighted'].any() else 'tract'}-weighted)")
+
+
+def cmd_bench(args):
+    from trauma_access.bench import format_report, previous_run, run_benchmark
+
+    record = run_benchmark(states=args.states or None, repeat=args.repeat, save=not args.no_save)
+    print(format_report(record, previous_run(skip=0 if args.no_save else 1)))
+
+
+def cmd_profile_summary(args):
+    from trauma_access.profiling import PROFILE_LOG, summarize_log
+
+    path = args.log or PROFILE_LOG
+    if not path:
+        raise SystemExit('no log file: pass --log or set TRAUMA_PROFILE_LOG')
+    print(summarize_log(path).to_string())
+
+
+def cmd_warm_cache(args):
+    from trauma_access.api import warm
+    from trauma_access.diskcache import get_disk_cache
+
+    failed = 0
+    for state, seconds, error in warm(states=args.states or None, year=args.year):
+        if error is None:
+            print(f'{state}: {seconds:.2f}s')
+        else:
+            failed += 1
+            print(f'{state} failed: {error}')
+    disk = get_disk_cache()
+    print(f'{disk.directory}: {len(disk.entries())} entries, {disk.size() / 1024 ** 2:.1f} MB')
+    if failed:
+        raise SystemExit(1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m trauma_access')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('ingest-tracts', help='store census tracts locally (pre-projected)')
+    p.add_argument('states', nargs='*', help='state codes, e.g. CA TX')
+    p.add_argument('--all', action='store_true', help='ingest every state')
+    p.add_argument('--year', type=int, default=TRACT_YEAR)
+    p.add_argument('--source', help='local TIGER cartographic boundary file instead of pygris')
+    p.set_defaults(func=cmd_ingest_tracts)
+
+    p = sub.add_parser('ingest-population', help='store tract population (ACS B01003) for weighted metrics')
+    p.add_argument('source', help='CSV with GEOID,population or a B01003 extract (GEO_ID, B01003_001E)')
+    p.add_argument('--year', type=int, default=TRACT_YEAR)
+    p.set_defaults(func=cmd_ingest_population)
+
+    p = sub.add_parser('ingest-cost', help='store per-state friction rasters for travel-time mode')
+    p.add_argument('source', help='friction GeoTIFF (needs rasterio)')
+    p.add_argument('states', nargs='+', help='state codes, e.g. AK WA')
+    p.add_argument('--cell-size', type=float, default=1000, help='grid cell size in m (default 1000)')
+    p.add_argument('--scale', type=float, default=1000.0,
+                   help='multiplier to minutes per km (default 1000, for minutes per metre)')
+    p.set_defaults(func=cmd_ingest_cost)
+
+    p = sub.add_parser('precompute', help='compute nearest-trauma distances for every tract')
+    p.add_argument('states', nargs='*', help='state codes (default: all states)')
+    p.add_argument('--workers', type=int, help='worker processes (default: CPU count)')
+    p.add_argument('--year', type=int, default=TRACT_YEAR)
+    p.set_defaults(func=cmd_precompute)
+
+    p = sub.add_parser('refresh', help='publish results for a new hospital release, recomputing only affected tracts')
+    p.add_argument('--base', help='version to refresh from (default: the latest with a facility list)')
+    p.add_argument('--year', type=int, default=TRACT_YEAR)
+    p.set_defaults(func=cmd_refresh)
+
+    p = sub.add_parser('summarize', help='rebuild the per-state summary table used by the comparison view')
+    p.add_argument('--version', help='results version (default: the current one)')
+    p.add_argument('--year', type=int, default=TRACT_YEAR)
+    p.set_defaults(func=cmd_summarize)
+
+    p = sub.add_parser('bench', help='time each pipeline stage offline on fixture tracts')
+    p.add_argument('states', nargs='*', help='state codes (default: small, median and largest)')
+    p.add_argument('--repeat', type=int, default=3, help='timed runs per stage (best is kept)')
+    p.add_argument('--no-save', action='store_true', help='do not append to .cache/bench/results.jsonl')
+    p.set_defaults(func=cmd_bench)
+
+    p = sub.add_parser('profile-summary', help='aggregate dashboard stage timings from the profile log')
+    p.add_argument('--log', help='profile log (default: $TRAUMA_PROFILE_LOG)')
+    p.set_defaults(func=cmd_profile_summary)
+
+    p = sub.add_parser('warm-cache', help='fill the disk cache before the server takes traffic')
+    p.add_argument('states', nargs='*', help='state codes (default: every state with hospitals)')
+    p.add_argument('--year', type=int, default=TRACT_YEAR)
+    p.set_defaults(func=cmd_warm_cache)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
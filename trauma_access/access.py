@@ -0,0 +1,55 @@
+# Population-weighted access statistics per state
+# Counting tracts treats a near-empty rural tract like a dense urban one. Given
+# each tract's nearest distance and population, access_summary() sorts the
+# distances once and reads everything off the cumulative population: mean,
+# percentiles, the share of residents within each threshold, and a coverage
+# curve on fixed bins (the same bins for every state, so curves and counts can
+# be compared or summed nationally). Without a population table every tract
+# weighs 1 and the same numbers describe tracts.
+
+import numpy as np
+
+PERCENTILES = [10, 25, 50, 75, 90, 95, 99]
+THRESHOLDS_KM = [10, 20, 30, 45, 60, 100]
+BIN_EDGES_KM = np.arange(0, 505, 5.0)  # fixed 5 km bins; the last also takes anything beyond
+
+
+def access_summary(distance_km, weights=None):
+    """Weighted distribution of nearest distance.
+
+    Returns a dict with weighted (bool), total (population, or tracts), tracts,
+    mean, max, percentiles {p: km}, share_within {km: fraction}, and counts
+    (population per BIN_EDGES_KM bin) and curve (share within each upper edge).
+    Tracts with no distance or no population are left out.
+    """
+    distance_km = np.asarray(distance_km, dtype=float)
+    weighted = weights is not None
+    weights = np.ones_like(distance_km) if weights is None else np.nan_to_num(np.asarray(weights, dtype=float))
+    keep = ~np.isnan(distance_km) & (weights > 0)
+    distance_km, weights = distance_km[keep], weights[keep]
+
+    order = np.argsort(distance_km, kind='stable')
+    distance_km, weights = distance_km[order], weights[order]
+    cumulative = np.cumsum(weights)
+    total = float(cumulative[-1]) if len(cumulative) else 0.0
+
+    if total > 0:
+        # Inverse CDF: the distance at which the cumulative population first reaches p%
+        at = np.searchsorted(cumulative, np.asarray(PERCENTILES) / 100 * total, side='left')
+        percentiles = dict(zip(PERCENTILES, distance_km[np.minimum(at, len(distance_km) - 1)].tolist()))
+        within = cumulative[np.searchsorted(distance_km, THRESHOLDS_KM, side='right') - 1]
+        within = np.where(np.asarray(THRESHOLDS_KM) >= distance_km[0], within, 0)
+        share_within = dict(zip(THRESHOLDS_KM, (within / total).tolist()))
+        mean, maximum = float(np.dot(distance_km, weights) / total), float(distance_km[-1])
+    else:
+        percentiles = dict.fromkeys(PERCENTILES, np.nan)
+        share_within = dict.fromkeys(THRESHOLDS_KM, np.nan)
+        mean = maximum = np.nan
+
+    counts, _ = np.histogram(np.minimum(distance_km, BIN_EDGES_KM[-1]), bins=BIN_EDGES_KM, weights=weights)
+    return {
+        'weighted': weighted, 'total': total, 'tracts': int(keep.sum()),
+        'mean': mean, 'max': maximum, 'median': percentiles[50],
+        'percentiles': percentiles, 'share_within': share_within,
+        'counts': counts, 'curve': np.cumsum(counts) / total if total > 0 else np.zeros_like(counts),
+    }
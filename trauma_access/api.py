@@ -0,0 +1,266 @@
+# Stable compute API shared by the dashboards, batch jobs and benchmarks
+# Each function is a pure function of the state code (plus the dataset
+# version), so results are cached process-wide and keyed by that version:
+# every app and job in the process reuses the same warmed data, and nothing
+# here needs Streamlit. Distances and chart artefacts also go to the disk
+# cache (trauma_access.diskcache), and warm() fills both before a deploy
+# takes traffic.
+
+import os
+import time
+
+from trauma_access.access import access_summary
+from trauma_access.cache import LRUCache, memoize
+from trauma_access.catchments import catchment_table, service_areas
+from trauma_access.charts import distance_histogram, histogram_image
+from trauma_access.hospitals import MISSING, get_hospital_store
+from trauma_access.insights import generate_insights
+from trauma_access.maps import distance_choropleth, hospital_points, view_for
+from trauma_access.metrics import get_metrics_table, list_states, state_metrics
+from trauma_access.population import load_population, population_version
+from trauma_access.profiling import stage
+from trauma_access.results import load_results, results_version
+from trauma_access.summaries import load_summaries, summary_row, summary_table
+from trauma_access.tracts import (
+    TRACT_YEAR, display_level, load_display_tracts, load_state_outline, load_tracts,
+)
+from trauma_access.travel import cost_raster_version, has_cost_raster, load_cost_raster, travel_times
+
+MAX_CACHED_STATES = 64
+MAX_CACHE_MB = float(os.environ.get('TRAUMA_CACHE_MB', 512))  # tracts and distances, estimated
+
+_cache = LRUCache(MAX_CACHED_STATES, max_bytes=MAX_CACHE_MB * 1024 ** 2, name='api')
+
+
+def dataset_version(year=TRACT_YEAR, population=False):
+    """Version string covering the hospital data, tract vintage and result schema
+    (and, with `population`, the population table)."""
+    if population:
+        return f"{results_version(year)}-p{population_version(year) or 'none'}"
+    return results_version(year)
+
+
+def state_hospitals(state):
+    """Hospitals in `state` (a view into the shared store)."""
+    return get_hospital_store().state(state)
+
+
+@memoize(_cache, key_func=lambda state, kind='analysis', year=TRACT_YEAR: (state, kind, year))
+def state_tracts(state, kind='analysis', year=TRACT_YEAR):
+    """Tracts for `state` from the local store, projected for `kind`."""
+    with stage('tract_load', state=state):
+        return load_tracts(state, kind, year)
+
+
+@memoize(_cache, key_func=lambda state, year=TRACT_YEAR: (state, dataset_version(year)), disk='distances')
+def state_distances(state, year=TRACT_YEAR):
+    """GEOID, nearest_dist_km and nearest_id per tract.
+
+    Precomputed results are used when present, otherwise the state is computed.
+    """
+    with stage('results_load', state=state):
+        distances = load_results(state, dataset_version(year))
+    if distances is None:
+        from trauma_access.precompute import compute_state_distances
+        tracts = state_tracts(state, 'analysis', year)
+        with stage('nearest_distance', state=state, tracts=len(tracts)):
+            distances = compute_state_distances(tracts, load_state_outline(state, year=year))
+    return distances
+
+
+@memoize(_cache, key_func=lambda state: (state, dataset_version()))
+def state_map_points(state):
+    """Hospitals in `state` reduced to what the map draws (see maps.hospital_points)."""
+    return hospital_points(state_hospitals(state))
+
+
+def state_choropleth(state, zoom=None, year=TRACT_YEAR):
+    """GeoJSON of the state's tracts shaded by nearest distance, at the display
+    level of detail for map `zoom` (default: the zoom that fits the state)."""
+    if zoom is None:
+        zoom = view_for(state_map_points(state))[2]
+    return _state_choropleth(state, display_level(zoom), year)
+
+
+@memoize(_cache, key_func=lambda state, level, year: (state, level, dataset_version(year)), disk='choropleth')
+def _state_choropleth(state, level, year):
+    return distance_choropleth(load_display_tracts(state, level, year), state_distances(state, year))
+
+
+@memoize(_cache, key_func=lambda state, year=TRACT_YEAR: (state, dataset_version(year, population=True)))
+def state_population(state, year=TRACT_YEAR):
+    """Population of each tract, aligned with state_distances() rows (0 where
+    unknown), or None when there is no population table."""
+    population = load_population(state, year)
+    if population is None:
+        return None
+    return state_distances(state, year)['GEOID'].map(population).fillna(0).to_numpy(dtype='int64')
+
+
+@memoize(_cache, key_func=lambda state, year=TRACT_YEAR: (state, dataset_version(year, population=True)),
+         disk='access')
+def state_access(state, year=TRACT_YEAR):
+    """Population-weighted access_summary() of the state's nearest distances
+    (tract-weighted without a population table)."""
+    return access_summary(state_distances(state, year)['nearest_dist_km'], state_population(state, year))
+
+
+@memoize(_cache, key_func=lambda state, year=TRACT_YEAR: (state, year))
+def state_centroids(state, year=TRACT_YEAR):
+    """GEOID and centroid (ANALYSIS_CRS) per tract, as the distance engine sees them."""
+    tracts = state_tracts(state, 'analysis', year)
+    return tracts['GEOID'].to_numpy(), tracts.centroid.to_numpy()
+
+
+def state_travel_times(state, year=TRACT_YEAR):
+    """Approximate minutes to the nearest trauma center per tract over the
+    state's friction raster, aligned with state_distances() rows (NaN where
+    unreachable), or None when the state has no raster."""
+    if not has_cost_raster(state):
+        return None
+    return _state_travel_times(state, year)
+
+
+@memoize(_cache, key_func=lambda state, year: (state, dataset_version(year), cost_raster_version(state)),
+         disk='travel')
+def _state_travel_times(state, year):
+    import pandas as pd
+
+    from trauma_access.nearest import national_index
+
+    geoids, centroids = state_centroids(state, year)
+    facilities = national_index().subset(load_state_outline(state, year=year)['envelope']).geoms
+    with stage('travel_cost', state=state, tracts=len(geoids)):
+        minutes = travel_times(load_cost_raster(state), facilities, centroids)
+    return pd.Series(minutes, index=geoids).reindex(state_distances(state, year)['GEOID']).to_numpy()
+
+
+def new_scenario(state, year=TRACT_YEAR):
+    """A fresh what-if Scenario for `state` (per session; not cached)."""
+    from trauma_access.nearest import national_index
+    from trauma_access.scenario import Scenario
+
+    geoids, centroids = state_centroids(state, year)
+    facilities = get_hospital_store().data.set_index('ID')[['NAME', 'TRAUMA_LEVEL', 'BEDS']]
+    return Scenario(state, geoids, centroids, state_distances(state, year), national_index(), facilities)
+
+
+def scenario_choropleth(scenario, zoom=None, year=TRACT_YEAR):
+    """state_choropleth() for a what-if Scenario's distances (not cached)."""
+    if zoom is None:
+        zoom = view_for(state_map_points(scenario.state))[2]
+    return distance_choropleth(load_display_tracts(scenario.state, display_level(zoom), year), scenario.distances())
+
+
+@memoize(_cache, key_func=lambda state, year=TRACT_YEAR: (state, dataset_version(year, population=True)),
+         disk='catchments')
+def state_catchments(state, year=TRACT_YEAR):
+    """Tracts, population, distances and beds per 100k served for every
+    hospital nearest to some tract in `state` (see catchments.catchment_table)."""
+    return catchment_table(state_distances(state, year), get_hospital_store().data,
+                           state_population(state, year), state=state)
+
+
+@memoize(_cache, key_func=lambda state, year=TRACT_YEAR: (state, dataset_version(year)), disk='service_areas')
+def state_service_areas(state, year=TRACT_YEAR):
+    """GeoJSON of the Voronoi service areas of the hospitals around `state`,
+    clipped to its outline (simplified, EPSG:4326; ID and NAME properties)."""
+    import shapely
+
+    from trauma_access.nearest import national_index
+
+    areas = service_areas(national_index(), load_state_outline(state, year=year))
+    areas = areas.set_geometry(shapely.simplify(areas.geometry.values, 200)).to_crs('EPSG:4326')
+    areas = areas.set_geometry(shapely.set_precision(areas.geometry.values, 1e-4))
+    areas['NAME'] = areas['ID'].map(get_hospital_store().data.set_index('ID')['NAME']).astype(str)
+    return areas[['ID', 'NAME', 'geometry']].__geo_interface__
+
+
+def scenario_catchments(scenario, year=TRACT_YEAR):
+    """state_catchments() under a what-if Scenario (not cached). Moved
+    hospitals keep their store row, new sites have no reported beds, and
+    closed hospitals are left out."""
+    import pandas as pd
+
+    hospitals = get_hospital_store().data[['ID', 'NAME', 'STATE', 'TRAUMA_LEVEL', 'BEDS']]
+    # A moved hospital is both removed and re-added under its ID
+    hospitals = hospitals[~hospitals['ID'].isin(scenario.removed - set(scenario.added))]
+    existing = set(hospitals['ID'])
+    sites = pd.DataFrame([
+        {'ID': i, 'NAME': site['NAME'], 'STATE': scenario.state, 'TRAUMA_LEVEL': site['level'], 'BEDS': MISSING}
+        for i, site in scenario.added.items() if i not in existing
+    ], columns=hospitals.columns)
+    hospitals = pd.concat([hospitals.astype({'STATE': str}), sites], ignore_index=True)
+    return catchment_table(scenario.distances(), hospitals, state_population(scenario.state, year),
+                           state=scenario.state)
+
+
+def state_summaries(states=None, year=TRACT_YEAR):
+    """Compact comparison rows (see trauma_access.summaries) for `states`
+    (default: every state with hospitals), in that order.
+
+    Rows come from the stored summary table; states missing from it are
+    summarized through state_access(), and left out if that fails (e.g.
+    tracts missing while offline).
+    """
+    import pandas as pd
+
+    states = list(states or list_states())
+    table = load_summaries(year)
+    stored = [] if table is None else [s for s in states if s in table.index]
+    rows = []
+    for state in states:
+        if state not in stored:
+            try:
+                rows.append(summary_row(state, state_access(state, year)))
+            except Exception:
+                continue
+    parts = ([table.loc[stored]] if stored else []) + ([summary_table(rows)] if rows else [])
+    if not parts:
+        return summary_table([])
+    combined = pd.concat(parts)
+    return combined.loc[[s for s in states if s in combined.index]]
+
+
+def distance_stats(distances, weights=None):
+    """Mean, median and max nearest distance (km), weighted by `weights` if given."""
+    min_dist = distances['nearest_dist_km']
+    if weights is not None:
+        summary = access_summary(min_dist, weights)
+        return {'mean': summary['mean'], 'median': summary['median'], 'max': summary['max']}
+    return {'mean': float(min_dist.mean()), 'median': float(min_dist.median()), 'max': float(min_dist.max())}
+
+
+def state_insights(state, year=TRACT_YEAR):
+    access = state_access(state, year)
+    if not access['weighted']:
+        stats = distance_stats(state_distances(state, year))
+        return generate_insights(state, stats['mean'], stats['median'], stats['max'], state_metrics(state))
+    return generate_insights(state, access['mean'], access['median'], access['max'], state_metrics(state),
+                             access=access)
+
+
+def warm(states=None, year=TRACT_YEAR):
+    """Compute and cache the metrics table, and distances, access summaries,
+    catchments, histograms and (where a friction raster exists) travel times
+    for `states` (default: all).
+
+    Yields (state, seconds, error) as each state finishes; a failing state
+    (e.g. tracts missing while offline) is reported and skipped.
+    """
+    get_metrics_table()
+    for state in states or list_states():
+        start = time.perf_counter()
+        try:
+            min_dist = state_distances(state, year)['nearest_dist_km']
+            weights = state_population(state, year)
+            chart_version = dataset_version(year, population=weights is not None)
+            distance_histogram(state, chart_version, min_dist, weights=weights)
+            histogram_image(state, chart_version, min_dist, weights=weights)
+            state_access(state, year)
+            state_catchments(state, year)
+            state_travel_times(state, year)
+        except Exception as e:
+            yield state, time.perf_counter() - start, e
+            continue
+        yield state, time.perf_counter() - start, None
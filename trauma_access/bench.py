@@ -0,0 +1,179 @@
+# Benchmark harness for the load -> metrics -> distance -> render pipeline
+# Runs each stage of the app04 pipeline on its own for a small, a median and
+# the largest state (by hospital count). It records the best wall time over
+# `repeat` runs and the peak Python-side memory (tracemalloc, one extra run;
+# GEOS allocations are not traced). Everything is offline: tracts come from
+# synthetic fixtures generated deterministically from each state's hospital
+# extent, not from pygris. Each run is appended to .cache/bench/results.jsonl
+# so it can be compared with the previous one.
+
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+
+import numpy as np
+
+from trauma_access.hospitals import CACHE_DIR, REPO_DIR, TRAUMA_PATH
+
+BENCH_DIR = os.path.join(CACHE_DIR, 'bench')
+FIXTURE_DIR = os.path.join(BENCH_DIR, 'fixtures')
+RESULTS_PATH = os.path.join(BENCH_DIR, 'results.jsonl')
+FIXTURE_VERSION = 1  # bump when the fixture generator changes
+TRACTS_PER_HOSPITAL = 130  # roughly the national ratio, so CA gets ~8k tracts
+VERTICES_PER_EDGE = 10  # densify fixture cells towards real tract vertex counts
+
+STAGES = [
+    'geojson_parse', 'columnar_load', 'state_filter', 'tract_load', 'reprojection',
+    'outline_buffer', 'national_index', 'nearest_distance', 'histogram', 'insights',
+]
+
+
+def pick_states(store):
+    """{'small': ..., 'median': ..., 'largest': ...} by hospital count."""
+    counts = sorted((len(store.state(s)), s) for s in store.states)
+    return {'small': counts[0][1], 'median': counts[len(counts) // 2][1], 'largest': counts[-1][1]}
+
+
+def fixture_path(state):
+    return os.path.join(FIXTURE_DIR, f'{state}-v{FIXTURE_VERSION}.parquet')
+
+
+def make_fixture(state, hospitals):
+    """Grid of densified cells over the state's hospital extent (EPSG:4269, like TIGER)."""
+    import geopandas as gpd
+    import shapely
+
+    from trauma_access.tracts import STATE_FIPS, _write_parquet
+
+    minx, miny, maxx, maxy = hospitals.total_bounds
+    pad = 0.5
+    minx, miny, maxx, maxy = minx - pad, miny - pad, maxx + pad, maxy + pad
+    n = max(len(hospitals), 1) * TRACTS_PER_HOSPITAL
+    aspect = (maxx - minx) / (maxy - miny)
+    nx = max(int(round(np.sqrt(n * aspect))), 1)
+    ny = max(int(round(n / nx)), 1)
+    xs, ys = np.linspace(minx, maxx, nx + 1), np.linspace(miny, maxy, ny + 1)
+    x0, y0 = np.meshgrid(xs[:-1], ys[:-1])
+    x1, y1 = np.meshgrid(xs[1:], ys[1:])
+    cells = shapely.box(x0.ravel(), y0.ravel(), x1.ravel(), y1.ravel())
+    cells = shapely.segmentize(cells, min(xs[1] - xs[0], ys[1] - ys[0]) / VERTICES_PER_EDGE)
+    fips = STATE_FIPS.get(state, '00')
+    fixture = gpd.GeoDataFrame(
+        {'GEOID': [f'{fips}{i:09d}' for i in range(len(cells))]}, geometry=cells, crs=4269,
+    )
+    _write_parquet(fixture, fixture_path(state))
+    return fixture
+
+
+def _timed(fn, repeat):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, best, peak
+
+
+def bench_state(state, repeat=3):
+    """({stage: {'seconds': ..., 'peak_mb': ...}}, tract count) for one state."""
+    import geopandas as gpd
+
+    from trauma_access.charts import bin_distances
+    from trauma_access.hospitals import HospitalStore, in_service, read_trauma
+    from trauma_access.insights import generate_insights
+    from trauma_access.metrics import state_metrics
+    from trauma_access.nearest import NearestFacilityIndex
+    from trauma_access.precompute import compute_state_distances
+    from trauma_access.tracts import ANALYSIS_CRS, build_state_outline, outline_geometries
+
+    stages = {}
+
+    def run(name, fn):
+        result, seconds, peak = _timed(fn, repeat)
+        stages[name] = {'seconds': round(seconds, 6), 'peak_mb': round(peak / 2**20, 3)}
+        return result
+
+    run('geojson_parse', lambda: gpd.read_file(TRAUMA_PATH))
+    store = run('columnar_load', lambda: HospitalStore(read_trauma()))
+    hospitals = run('state_filter', lambda: store.state(state))
+
+    if not os.path.exists(fixture_path(state)):
+        make_fixture(state, hospitals)
+    raw = run('tract_load', lambda: gpd.read_parquet(fixture_path(state)))
+    tracts = run('reprojection', lambda: raw.to_crs(ANALYSIS_CRS))
+    outline = run('outline_buffer', lambda: outline_geometries(build_state_outline(tracts)))
+    index = run('national_index', lambda: NearestFacilityIndex(in_service(store.data).to_crs(ANALYSIS_CRS)))
+    distances = run('nearest_distance', lambda: compute_state_distances(tracts, outline, index=index))
+    hist = run('histogram', lambda: bin_distances(distances['nearest_dist_km']))
+    run('insights', lambda: generate_insights(state, hist['mean'], hist['median'], hist['max'],
+                                              state_metrics(state)))
+    return stages, len(tracts)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+                              capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_benchmark(states=None, repeat=3, save=True):
+    """Benchmark the given states (default: small/median/largest) and store the run."""
+    from trauma_access.hospitals import get_hospital_store
+
+    if states is None:
+        states = pick_states(get_hospital_store())
+    else:
+        states = {s: s for s in states}
+    record = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'repeat': repeat,
+        'states': {},
+    }
+    for label, state in states.items():
+        stages, n_tracts = bench_state(state, repeat)
+        record['states'][label] = {'state': state, 'tracts': n_tracts, 'stages': stages}
+    if save:
+        os.makedirs(BENCH_DIR, exist_ok=True)
+        with open(RESULTS_PATH, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+    return record
+
+
+def previous_run(path=RESULTS_PATH, skip=1):
+    """The stored run `skip` entries before the newest one (None if there is none)."""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        lines = [line for line in f if line.strip()]
+    return json.loads(lines[-1 - skip]) if len(lines) > skip else None
+
+
+def format_report(record, baseline=None):
+    """Plain-text table of seconds / peak MB per stage, with % change vs `baseline`."""
+    lines = []
+    for label, entry in record['states'].items():
+        state, stages = entry['state'], entry['stages']
+        lines.append(f"{label}: {state} ({entry['tracts']} tracts)")
+        base = None
+        if baseline:
+            base = next((e['stages'] for e in baseline['states'].values() if e['state'] == state), None)
+        for stage in [s for s in STAGES if s in stages]:
+            s = stages[stage]
+            line = f"  {stage:<18}{s['seconds'] * 1000:>10.1f} ms{s['peak_mb']:>10.2f} MB"
+            if base and stage in base and base[stage]['seconds'] > 0:
+                change = (s['seconds'] / base[stage]['seconds'] - 1) * 100
+                line += f'{change:>+9.0f}%'
+            lines.append(line)
+    return '\n'.join(lines)
@@ -0,0 +1,181 @@
+# Process-wide memo cache
+# The caches live in the trauma_access module, so every dashboard and batch job
+# in the process shares them. memoize(disk=...) adds the on-disk cache
+# (trauma_access.diskcache) behind the in-memory one, so results also survive
+# restarts.
+#
+# Values are shared, not copied: a hit returns the cached object itself, so
+# callers must treat results as read-only. Each cache is bounded by entry count
+# and by the estimated size of its values; cache_report() lists every cache's
+# occupancy.
+
+import functools
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from trauma_access.diskcache import get_disk_cache
+
+GEOMETRY_BYTES = 100  # per-geometry overhead on top of 16 bytes per coordinate
+
+_caches = weakref.WeakValueDictionary()
+
+
+def estimate_size(value):
+    """Approximate memory held by a cached value, in bytes.
+
+    Frames are measured with memory_usage(deep=True); geometry columns by
+    their coordinate count, since pandas only sees one pointer per geometry.
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, pd.DataFrame):
+        geometry = [c for c in value.columns if value[c].dtype.name == 'geometry']
+        size = int(value.drop(columns=geometry).memory_usage(deep=True).sum())
+        if geometry:
+            import shapely
+
+            for column in geometry:
+                coords = shapely.get_num_coordinates(np.asarray(value[column].array))
+                size += int(coords.sum()) * 16 + len(value) * GEOMETRY_BYTES
+        return size
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """Thread-safe LRU mapping bounded by entry count and, optionally, by the
+    estimated byte size of its values (see estimate_size)."""
+
+    def __init__(self, max_entries=128, max_bytes=None, name=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.name = name or f'cache-{id(self):x}'
+        self._items = OrderedDict()
+        self._sizes = {}
+        self._pending = {}  # key -> [lock, waiters] while being computed
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        _caches[self.name] = self
+
+    @property
+    def last_hit(self):
+        """Whether this thread's most recent lookup was a hit (None before any lookup)."""
+        return getattr(self._local, 'hit', None)
+
+    def __len__(self):
+        return len(self._items)
+
+    def get_or_create(self, key, create):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                self._local.hit = True
+                return self._items[key]
+            pending = self._pending.setdefault(key, [threading.Lock(), 0])
+            pending[1] += 1
+        # One thread computes a missing key; others asking for it meanwhile
+        # (e.g. a rerun catching up with the prefetcher) wait for that result
+        try:
+            with pending[0]:
+                with self._lock:
+                    if key in self._items:
+                        self._items.move_to_end(key)
+                        self.hits += 1
+                        self._local.hit = True
+                        return self._items[key]
+                    self.misses += 1
+                    self._local.hit = False
+                value = create()
+                self._store(key, value)
+                return value
+        finally:
+            with self._lock:
+                pending[1] -= 1
+                if not pending[1]:
+                    del self._pending[key]
+
+    def _store(self, key, value):
+        size = estimate_size(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return  # larger than the whole budget: hand it back uncached
+        with self._lock:
+            if key in self._items:
+                self.nbytes -= self._sizes[key]
+            self._items[key] = value
+            self._sizes[key] = size
+            self.nbytes += size
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries or (
+                    self.max_bytes is not None and self.nbytes > self.max_bytes):
+                old, _ = self._items.popitem(last=False)
+                self.nbytes -= self._sizes.pop(old)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._sizes.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        return {
+            'cache': self.name, 'entries': len(self._items), 'max_entries': self.max_entries,
+            'mb': round(self.nbytes / 1024 ** 2, 2),
+            'max_mb': None if self.max_bytes is None else round(self.max_bytes / 1024 ** 2, 2),
+            'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+        }
+
+
+def cache_report():
+    """Occupancy of every in-memory cache in the process, one row per cache."""
+    return [cache.stats() for _, cache in sorted(_caches.items())]
+
+
+def memoize(cache, key_func=None, disk=None):
+    """Cache a function's results in `cache`, keyed by its name and arguments
+    (or by `key_func(*args, **kwargs)`, e.g. to add a dataset version).
+
+    With `disk` (a namespace), memory misses fall back to the disk cache; the
+    key must then identify the data it was computed from.
+    """
+    def decorator(func):
+        local = threading.local()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = key_func(*args, **kwargs) if key_func else (args, tuple(sorted(kwargs.items())))
+            created = []
+
+            def create():
+                created.append(True)
+                if disk:
+                    return get_disk_cache().get_or_create(disk, key, lambda: func(*args, **kwargs))
+                return func(*args, **kwargs)
+            try:
+                return cache.get_or_create((func.__name__, key), create)
+            finally:
+                # This call's own lookup: nested memoized calls sharing the cache
+                # overwrite cache.last_hit, but not this
+                local.hit = not created
+
+        wrapper.cache = cache
+        wrapper.last_hit = lambda: getattr(local, 'hit', None)
+        return wrapper
+    return decorator
@@ -0,0 +1,86 @@
+# Catchment areas: the tracts, residents and beds each hospital serves
+# The inverse of the nearest-distance view. Every tract is assigned to its
+# nearest hospital (nearest_id from the distance results), and one group-by
+# over the tracts gives each hospital's tract count, served population and
+# distance spread. Beds per 100k served uses BEDS, where -999 (not reported)
+# gives NaN rather than a negative rate. Hospitals across the state line that
+# serve its tracts are included.
+#
+# service_areas() adds Voronoi polygons of the hospitals around the state,
+# clipped to its outline, for display; they approximate the tract-based
+# catchments with straight-line boundaries.
+
+import numpy as np
+import pandas as pd
+
+from trauma_access.hospitals import MISSING
+
+CATCHMENT_COLUMNS = [
+    'ID', 'NAME', 'STATE', 'TRAUMA_LEVEL', 'BEDS', 'tracts', 'population',
+    'mean_dist_km', 'max_dist_km', 'beds_per_100k',
+]
+
+
+def catchment_table(distances, hospitals, weights=None, state=None):
+    """One row per hospital serving the tracts in `distances`.
+
+    `hospitals` is the normalized store frame (national, so out-of-state
+    hospitals get their attributes); `weights` is tract population aligned
+    with `distances` (None counts tracts only, and leaves population and
+    beds_per_100k empty). With `state`, that state's hospitals that serve no
+    tract are listed too, with zero tracts.
+    """
+    served = pd.DataFrame({
+        'ID': distances['nearest_id'].to_numpy(),
+        'dist': distances['nearest_dist_km'].to_numpy(),
+        'population': np.zeros(len(distances)) if weights is None else np.asarray(weights, dtype=float),
+    })
+    served['weighted_dist'] = served['dist'] * served['population']
+    table = served.groupby('ID', sort=False).agg(
+        tracts=('dist', 'size'), population=('population', 'sum'),
+        weighted_dist=('weighted_dist', 'sum'), mean_dist_km=('dist', 'mean'), max_dist_km=('dist', 'max'),
+    )
+    if weights is not None:
+        # Residents' mean distance rather than the tracts'
+        with np.errstate(invalid='ignore', divide='ignore'):
+            table['mean_dist_km'] = np.where(table['population'] > 0,
+                                             table['weighted_dist'] / table['population'], table['mean_dist_km'])
+    table = table.drop(columns='weighted_dist')
+
+    attributes = hospitals.set_index('ID')[['NAME', 'STATE', 'TRAUMA_LEVEL', 'BEDS']]
+    ids = table.index
+    if state is not None:
+        ids = ids.union(attributes.index[attributes['STATE'] == state], sort=False)
+    table = table.reindex(ids).fillna({'tracts': 0, 'population': 0}).join(attributes)
+    table['tracts'] = table['tracts'].astype('int64')
+
+    beds = table['BEDS'].to_numpy(dtype=float)
+    population = table['population'].to_numpy(dtype=float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rate = np.where((beds != MISSING) & (population > 0), beds / population * 100000, np.nan)
+    table['beds_per_100k'] = rate
+    if weights is None:
+        table['population'] = np.nan
+    table = table.reset_index(names='ID')
+    return table[CATCHMENT_COLUMNS].sort_values(['tracts', 'ID'], ascending=[False, True], ignore_index=True)
+
+
+def service_areas(index, outline):
+    """Voronoi service polygons (ID, geometry in the index CRS) of the
+    hospitals within the state's search envelope, clipped to its outline.
+
+    `outline` is a load_state_outline() dict; polygons that miss the state
+    are dropped.
+    """
+    import geopandas as gpd
+    import shapely
+
+    nearby = index.subset(outline['envelope'])
+    if len(nearby) == 0:
+        return gpd.GeoDataFrame({'ID': []}, geometry=[], crs=index.crs)
+    # Hospitals sharing a position share a cell
+    coords, inverse = np.unique(shapely.get_coordinates(nearby.geoms), axis=0, return_inverse=True)
+    cells = shapely.voronoi_polygons(shapely.multipoints(coords), extend_to=outline['envelope'], ordered=True)
+    cells = shapely.intersection(shapely.get_parts(cells)[inverse.ravel()], outline['outline'])
+    areas = gpd.GeoDataFrame({'ID': nearby.ids}, geometry=cells, crs=index.crs)
+    return areas[~areas.geometry.is_empty].reset_index(drop=True)
@@ -0,0 +1,181 @@
+# Distance histogram: binning and rendering, memoized
+# The binned counts and the rendered PNG are cached under (state, data version,
+# bin width), so Streamlit reruns from other widgets reuse them, and are also
+# kept in the disk cache, so they survive restarts. Figures are built with the
+# object-oriented Figure API, so they are not registered with pyplot and are
+# freed once rendered. histogram_chart() is a lightweight vector (Vega-Lite)
+# alternative; comparison_chart() overlays several states from their
+# precomputed summaries.
+
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+from trauma_access.access import access_summary
+from trauma_access.cache import LRUCache
+from trauma_access.diskcache import get_disk_cache
+from trauma_access.profiling import stage
+
+MAX_CACHED = 128  # entries per cache (counts and images)
+MAX_CACHE_MB = float(os.environ.get('TRAUMA_CHART_CACHE_MB', 64))  # per cache
+
+_histograms = LRUCache(MAX_CACHED, max_bytes=MAX_CACHE_MB * 1024 ** 2, name='histograms')
+_images = LRUCache(MAX_CACHED, max_bytes=MAX_CACHE_MB * 1024 ** 2, name='histogram_images')
+
+# Axis label and title wording per unit: straight-line km or travel minutes
+UNIT_LABELS = {
+    'km': ('Distance (km)', 'Distribution of Minimum Distance to Trauma Centers'),
+    'min': ('Travel time (min)', 'Distribution of Approximate Travel Time to Trauma Centers'),
+}
+
+
+def auto_bin_width(x_max):
+    # 0.5 km bins for small ranges, 1 km for medium, 2 km for large
+    if x_max <= 20:
+        return 0.5
+    elif x_max <= 50:
+        return 1
+    return 2
+
+
+def bin_distances(min_dist, bin_width=None, weights=None, unit='km'):
+    """Pre-binned histogram plus the summary statistics drawn on the chart.
+
+    With `weights` (tract population) the bars count residents and the mean
+    and median are population-weighted. `unit` is 'km', or 'min' for travel
+    times.
+    """
+    values = np.asarray(min_dist, dtype=float)
+    if weights is not None:
+        summary = access_summary(values, weights)
+        mean, median, maximum = summary['mean'], summary['median'], summary['max']
+        weights = np.asarray(weights, dtype=float)[~np.isnan(values)]
+        values = values[~np.isnan(values)]
+    else:
+        values = values[~np.isnan(values)]
+        mean, median, maximum = (float(f(values)) for f in (np.mean, np.median, np.max)) if len(values) else (np.nan,) * 3
+    x_max = maximum * 1.1 if len(values) else 1.0  # 10% padding past the furthest tract
+    bin_width = bin_width or auto_bin_width(x_max)
+    edges = np.arange(0, x_max + bin_width, bin_width)
+    counts, edges = np.histogram(values, bins=edges, weights=weights)
+    return {
+        'counts': counts, 'edges': edges, 'bin_width': bin_width, 'x_max': x_max,
+        'mean': mean, 'median': median, 'max': maximum, 'weighted': weights is not None, 'unit': unit,
+    }
+
+
+def distance_histogram(state, version, min_dist, bin_width=None, weights=None, unit='km'):
+    """bin_distances() memoized on (state, data version, bin width, weighted, unit).
+
+    The version must cover the population table when `weights` are given
+    (and the friction raster for travel times).
+    """
+    key = ('hist', state, version, bin_width, weights is not None, unit)
+    return _histograms.get_or_create(key, lambda: get_disk_cache().get_or_create(
+        'histogram', key, lambda: bin_distances(min_dist, bin_width, weights, unit),
+    ))
+
+
+def count_label(hist):
+    return 'Number of Residents' if hist.get('weighted') else 'Number of Census Tracts'
+
+
+def unit_labels(hist):
+    """(unit, x-axis label, title) for a bin_distances() result."""
+    unit = hist.get('unit', 'km')
+    return (unit, *UNIT_LABELS[unit])
+
+
+def render_histogram(hist, state, figsize=(12, 6), dpi=100):
+    """PNG bytes of the histogram with mean/median reference lines."""
+    with stage('figure_render', state=state):
+        return _render_histogram(hist, state, figsize, dpi)
+
+
+def _render_histogram(hist, state, figsize, dpi):
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize, dpi=dpi)
+    ax = fig.subplots()
+    edges, x_max = hist['edges'], hist['x_max']
+    unit, x_label, title = unit_labels(hist)
+    ax.hist(edges[:-1], bins=edges, weights=hist['counts'],
+            alpha=0.7, color='steelblue', edgecolor='black', linewidth=0.5)
+
+    ax.axvline(hist['mean'], color='red', linestyle='--', linewidth=2, alpha=0.8)
+    ax.axvline(hist['median'], color='orange', linestyle='--', linewidth=2, alpha=0.8)
+    y_max = ax.get_ylim()[1]
+    label_offset = x_max * 0.01  # 1% of x-range for label positioning
+    ax.text(hist['mean'] + label_offset, y_max * 0.9, f"Mean: {hist['mean']:.1f} {unit}",
+            color='red', fontweight='bold', fontsize=10)
+    ax.text(hist['median'] + label_offset, y_max * 0.8, f"Median: {hist['median']:.1f} {unit}",
+            color='orange', fontweight='bold', fontsize=10)
+
+    ax.set_xlabel(x_label, fontsize=12)
+    ax.set_ylabel(count_label(hist), fontsize=12)
+    ax.set_title(f'{title} - {state}', fontsize=14, fontweight='bold')
+    ax.grid(True, alpha=0.3)
+    ax.set_xlim(0, x_max)
+
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', bbox_inches='tight')
+    fig.clear()
+    return buf.getvalue()
+
+
+def histogram_image(state, version, min_dist, bin_width=None, weights=None, unit='km'):
+    """Rendered PNG, memoized on the same key as the binned counts."""
+    key = ('png', state, version, bin_width, weights is not None, unit)
+    return _images.get_or_create(key, lambda: get_disk_cache().get_or_create('histogram', key, lambda: render_histogram(
+        distance_histogram(state, version, min_dist, bin_width, weights, unit), state,
+    )))
+
+
+def histogram_frame(hist):
+    """Counts as a tidy frame (bin start/end, tracts) for vector charts."""
+    edges = hist['edges']
+    return pd.DataFrame({'start': edges[:-1], 'end': edges[1:], 'tracts': hist['counts']})
+
+
+def histogram_chart(hist, state):
+    """Vega-Lite version of the histogram: only bin counts go to the browser."""
+    import altair as alt
+
+    unit, x_label, title = unit_labels(hist)
+    bars = alt.Chart(histogram_frame(hist)).mark_bar(color='steelblue', opacity=0.7).encode(
+        x=alt.X('start:Q', bin='binned', title=x_label, scale=alt.Scale(domain=[0, hist['x_max']])),
+        x2='end:Q',
+        y=alt.Y('tracts:Q', title=count_label(hist)),
+        tooltip=['start', 'end', 'tracts'],
+    )
+    lines = pd.DataFrame({
+        'stat': [f"Mean: {hist['mean']:.1f} {unit}", f"Median: {hist['median']:.1f} {unit}"],
+        'km': [hist['mean'], hist['median']],
+    })
+    rules = alt.Chart(lines).mark_rule(strokeDash=[6, 4], size=2).encode(
+        x='km:Q',
+        color=alt.Color('stat:N', scale=alt.Scale(range=['red', 'orange']), title=None),
+    )
+    return (bars + rules).properties(title=f'{title} - {state}')
+
+
+def comparison_chart(distribution, cumulative=False):
+    """Vega-Lite lines of several states' distance distributions, from a
+    summaries.distribution_frame() (shares on the fixed 5 km bins)."""
+    import altair as alt
+
+    # The axis stops where the furthest state's distribution does
+    if cumulative:
+        reach = distribution.loc[distribution['share'] < 0.999, 'end']
+    else:
+        reach = distribution.loc[distribution['share'] > 0, 'end']
+    x_max = float(reach.max()) + 5 if len(reach) else 100.0
+    title = 'Share Within Distance of a Trauma Center' if cumulative else UNIT_LABELS['km'][1]
+    return alt.Chart(distribution[distribution['start'] < x_max]).mark_line(interpolate='step-after').encode(
+        x=alt.X('start:Q', title='Distance (km)', scale=alt.Scale(domain=[0, x_max])),
+        y=alt.Y('share:Q', title='Share within' if cumulative else 'Share per 5 km', axis=alt.Axis(format='%')),
+        color=alt.Color('state:N', title='State'),
+        tooltip=['state', 'start', 'end', alt.Tooltip('share:Q', format='.1%')],
+    ).properties(title=title)
@@ -0,0 +1,151 @@
+# Disk-backed cache for per-state artefacts, shared across restarts
+# Behind the per-process LRUCache/memoize layer, artefacts (nearest distances,
+# histogram counts and images, the metrics table, ...) are pickled under
+# .cache/artefacts/ by default:
+#
+#   <namespace>-<sha1>.pkl    sha1 of (namespace, key, code version)
+#
+# Keys already carry the dataset version (see api.dataset_version); the code
+# version is a hash of the trauma_access sources, so editing the package
+# orphans old entries instead of serving stale ones. The directory is bounded
+# by size: reads refresh a file's mtime and writes evict the least recently
+# used files past TRAUMA_DISK_CACHE_MB (0 turns the disk cache off).
+# Writes go through a temp file and os.replace, so concurrent processes never
+# see a partial entry.
+
+import hashlib
+import os
+import pickle
+import threading
+
+from trauma_access.hospitals import CACHE_DIR
+
+DISK_CACHE_DIR = os.environ.get('TRAUMA_DISK_CACHE_DIR', os.path.join(CACHE_DIR, 'artefacts'))
+DISK_CACHE_MB = float(os.environ.get('TRAUMA_DISK_CACHE_MB', 2048))
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_code_version = None
+
+
+def code_version():
+    """Short hash of the trauma_access source files."""
+    global _code_version
+    if _code_version is None:
+        digest = hashlib.sha1()
+        for name in sorted(os.listdir(PACKAGE_DIR)):
+            if name.endswith('.py'):
+                digest.update(name.encode())
+                with open(os.path.join(PACKAGE_DIR, name), 'rb') as f:
+                    digest.update(f.read())
+        _code_version = digest.hexdigest()[:12]
+    return _code_version
+
+
+class DiskCache:
+    """Pickle store bounded by total bytes, evicting least recently used files."""
+
+    def __init__(self, directory=DISK_CACHE_DIR, max_bytes=DISK_CACHE_MB * 1024 ** 2):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def path(self, namespace, key):
+        digest = hashlib.sha1(repr((namespace, key, code_version())).encode()).hexdigest()
+        return os.path.join(self.directory, f'{namespace}-{digest[:20]}.pkl')
+
+    def get(self, namespace, key, default=None):
+        path = self.path(namespace, key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return default
+        except Exception:
+            # Truncated or unreadable (e.g. written by another library version)
+            self.misses += 1
+            self._remove(path)
+            return default
+        self.hits += 1
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+        return value
+
+    def put(self, namespace, key, value):
+        path = self.path(namespace, key)
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        self.evict()
+
+    def get_or_create(self, namespace, key, create):
+        if not self.enabled:
+            return create()
+        missing = object()
+        value = self.get(namespace, key, missing)
+        if value is missing:
+            value = create()
+            self.put(namespace, key, value)
+        return value
+
+    def entries(self):
+        """(mtime, size, path) of every entry, oldest first."""
+        try:
+            files = [e for e in os.scandir(self.directory) if e.name.endswith('.pkl')]
+        except FileNotFoundError:
+            return []
+        entries = []
+        for entry in files:
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return sorted(entries)
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """Remove least recently used entries until the directory fits max_bytes."""
+        with self._lock:
+            entries = self.entries()
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                self._remove(path)
+                total -= size
+
+    def clear(self):
+        for _, _, path in self.entries():
+            self._remove(path)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+_disk_cache = None
+
+
+def get_disk_cache():
+    """Process-wide DiskCache configured from the environment."""
+    global _disk_cache
+    if _disk_cache is None:
+        _disk_cache = DiskCache()
+    return _disk_cache
@@ -0,0 +1,223 @@
+# Hospital data access
+# trauma.geojson is converted once into a GeoParquet file under .cache/, keyed by
+# the source file's content hash. Later reads are columnar: only the requested
+# columns are decoded and rows can be filtered on STATE before they reach pandas.
+# Editing or replacing the GeoJSON triggers a rebuild on the next read.
+#
+# The shared HospitalStore holds a normalized analysis frame rather than the raw
+# file: unused columns are never decoded, repeated strings are categoricals,
+# TRAUMA is parsed into integer level codes and flags, and numbers are downcast.
+
+import hashlib
+import json
+import os
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+from trauma_access.profiling import stage
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRAUMA_PATH = os.path.join(REPO_DIR, 'trauma.geojson')
+CACHE_DIR = os.path.join(REPO_DIR, '.cache')
+
+# Columns the dashboards and analysis read. SOURCE, WEBSITE, the validation
+# metadata and the duplicate LATITUDE/LONGITUDE are left out of the store.
+ANALYSIS_COLUMNS = [
+    'OBJECTID', 'ID', 'NAME', 'ADDRESS', 'CITY', 'STATE', 'ZIP', 'TYPE', 'STATUS',
+    'POPULATION', 'COUNTY', 'COUNTYFIPS', 'ST_FIPS', 'OWNER', 'TTL_STAFF', 'BEDS',
+    'TRAUMA', 'HELIPAD', 'lat', 'lon',
+]
+CATEGORY_COLUMNS = ['STATE', 'TYPE', 'STATUS', 'OWNER', 'TRAUMA', 'ST_FIPS']
+MISSING = -999  # sentinel the source uses for unknown numbers
+
+ROMAN_LEVELS = {'I': 1, 'II': 2, 'III': 3, 'IV': 4, 'V': 5}
+LEVEL_PATTERN = re.compile(r'LEVEL (IV|V|I{1,3})\b')
+NO_LEVEL = 0  # RTC / RTH / missing
+
+
+def source_hash(path=TRAUMA_PATH, cache_dir=CACHE_DIR):
+    """Content hash of the source file, re-hashed only when mtime/size change."""
+    stat = os.stat(path)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    meta_path = os.path.join(cache_dir, f'{stem}.json')
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta['mtime_ns'] == stat.st_mtime_ns and meta['size'] == stat.st_size:
+            return meta['hash']
+    except (OSError, ValueError, KeyError):
+        pass
+
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    digest = h.hexdigest()[:16]
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = f'{meta_path}.{os.getpid()}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump({'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'hash': digest}, f)
+    os.replace(tmp, meta_path)
+    return digest
+
+
+def trauma_parquet_path(path=TRAUMA_PATH, cache_dir=CACHE_DIR):
+    """Path of the columnar copy of `path`, (re)building it if it is stale."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    digest = source_hash(path, cache_dir)
+    parquet_path = os.path.join(cache_dir, f'{stem}-{digest}.parquet')
+    if os.path.exists(parquet_path):
+        return parquet_path
+
+    import geopandas as gpd
+
+    trauma = gpd.read_file(path)
+    # Sorted by STATE so row-group statistics let state filters skip most of the file
+    trauma = trauma.sort_values('STATE', kind='stable').reset_index(drop=True)
+    tmp = f'{parquet_path}.{os.getpid()}.tmp'
+    trauma.to_parquet(tmp, index=False, row_group_size=128)
+    os.replace(tmp, parquet_path)
+
+    # Drop copies built from older versions of the source
+    for name in os.listdir(cache_dir):
+        if name.startswith(f'{stem}-') and name.endswith('.parquet') and name != os.path.basename(parquet_path):
+            try:
+                os.remove(os.path.join(cache_dir, name))
+            except OSError:
+                pass
+    return parquet_path
+
+
+def read_trauma(columns=None, states=None, path=TRAUMA_PATH, cache_dir=CACHE_DIR):
+    """Read hospitals from the columnar cache.
+
+    `columns` limits the attribute columns decoded (geometry is always read);
+    `states` is an optional list of STATE codes to keep.
+    """
+    import geopandas as gpd
+
+    parquet_path = trauma_parquet_path(path, cache_dir)
+    if columns is not None:
+        columns = list(dict.fromkeys([*columns, 'geometry']))
+    filters = [('STATE', 'in', list(states))] if states is not None else None
+    return gpd.read_parquet(parquet_path, columns=columns, filters=filters)
+
+
+def read_trauma_table(columns=None, path=TRAUMA_PATH, cache_dir=CACHE_DIR):
+    """Attribute columns as a plain DataFrame, without geopandas or geometry decoding."""
+    return pd.read_parquet(trauma_parquet_path(path, cache_dir), columns=columns)
+
+
+def parse_trauma(value):
+    """(highest level, adult, pediatric) for one TRAUMA string.
+
+    Level 1 is Level I; 0 means no trauma level (RTC, RTH, missing). The string
+    is a comma or slash separated list such as 'LEVEL I ADULT, LEVEL II
+    PEDIATRIC'. A part without its own level inherits the previous one, and
+    REHAB designations do not count as trauma levels.
+    """
+    if not isinstance(value, str):
+        return NO_LEVEL, False, False
+    levels, adult, pediatric = [], False, False
+    level = None
+    for part in re.split(r'[,/]', value):
+        found = LEVEL_PATTERN.search(part)
+        if found:
+            level = ROMAN_LEVELS[found.group(1)]
+        if level is None or 'REHAB' in part:
+            continue
+        levels.append(level)
+        if 'PEDIATRIC' in part:
+            pediatric = True
+        else:
+            adult = True
+    return (min(levels) if levels else NO_LEVEL), adult, pediatric
+
+
+def trauma_columns(trauma_col):
+    """TRAUMA_LEVEL / TRAUMA_ADULT / TRAUMA_PEDIATRIC, parsing each distinct string once."""
+    codes = pd.Categorical(trauma_col)
+    parsed = [parse_trauma(c) for c in codes.categories] + [parse_trauma(None)]
+    level, adult, pediatric = (np.array(col) for col in zip(*parsed))
+    return pd.DataFrame({
+        'TRAUMA_LEVEL': level.astype('int8')[codes.codes],
+        'TRAUMA_ADULT': adult.astype(bool)[codes.codes],
+        'TRAUMA_PEDIATRIC': pediatric.astype(bool)[codes.codes],
+    }, index=trauma_col.index)
+
+
+def normalize_hospitals(trauma):
+    """Compact analysis frame: categoricals, parsed trauma levels, downcast numbers."""
+    keep = [c for c in [*ANALYSIS_COLUMNS, 'geometry'] if c in trauma.columns]
+    trauma = trauma[keep].copy()
+    if 'TRAUMA' in trauma.columns:
+        trauma = trauma.join(trauma_columns(trauma['TRAUMA']))
+    if 'HELIPAD' in trauma.columns:
+        trauma['HELIPAD'] = (trauma['HELIPAD'] == 'Y').to_numpy()
+    for col in [c for c in CATEGORY_COLUMNS if c in trauma.columns]:
+        trauma[col] = trauma[col].astype(pd.CategoricalDtype(sorted(trauma[col].dropna().unique())))
+    for col in [c for c in ['OBJECTID', 'POPULATION', 'TTL_STAFF', 'BEDS'] if c in trauma.columns]:
+        trauma[col] = pd.to_numeric(trauma[col], downcast='integer')
+    return trauma
+
+
+def in_service(trauma):
+    """Hospitals that can take patients (STATUS other than CLOSED)."""
+    if 'STATUS' not in trauma.columns:
+        return trauma
+    return trauma[(trauma['STATUS'] != 'CLOSED').to_numpy()]
+
+
+class HospitalStore:
+    """All hospitals parsed once, with a STATE -> row-range index.
+
+    Rows are sorted by STATE, so each state's hospitals are one contiguous
+    block and `state()` is a dict lookup plus an `iloc` slice (a view, not a
+    copy). Memory does not grow with the number of states visited.
+    """
+
+    def __init__(self, trauma, version=None):
+        self.version = version
+        self.data = normalize_hospitals(trauma).sort_values('STATE', kind='stable').reset_index(drop=True)
+        state_col = self.data['STATE']
+        codes, starts = np.unique(state_col.cat.codes.to_numpy(), return_index=True)
+        stops = np.append(starts[1:], len(state_col))
+        names = state_col.cat.categories[codes]
+        self._slices = {s: slice(int(a), int(b)) for s, a, b in zip(names, starts, stops)}
+
+    @property
+    def states(self):
+        return list(self._slices)
+
+    def __contains__(self, state):
+        return state in self._slices
+
+    def state(self, state):
+        return self.data.iloc[self._slices.get(state, slice(0, 0))]
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_hospital_store(path=TRAUMA_PATH, cache_dir=CACHE_DIR):
+    """Process-wide HospitalStore for the current version of `path`."""
+    version = source_hash(path, cache_dir)
+    key = (os.path.abspath(path), version)
+    store = _stores.get(key)
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(key)
+            if store is None:
+                with stage('hospital_load'):
+                    trauma = read_trauma(columns=ANALYSIS_COLUMNS, path=path, cache_dir=cache_dir)
+                    store = HospitalStore(trauma, version=version)
+                # Only the latest version of each file is kept
+                for old in [k for k in _stores if k[0] == key[0]]:
+                    del _stores[old]
+                _stores[key] = store
+    return store
@@ -0,0 +1,73 @@
+# Natural-language takeaways for the insights section of the dashboard
+# Pure function of a state's distance statistics and metric-card values, so
+# it can be rendered by any app or reused by batch reports. With a
+# population-weighted access summary (see trauma_access.access) the statistics
+# describe residents, and the share living within reach of care is added.
+
+
+def generate_insights(state, mean_dist, median_dist, max_dist, metrics, access=None):
+    """List of HTML-formatted insight strings (<strong> headline, then detail).
+
+    Pass the weighted mean/median/max together with `access` (a weighted
+    access_summary) to add the population coverage insight.
+    """
+    insights = []
+
+    # Accessibility assessment based on mean distance
+    if mean_dist <= 10:
+        insights.append(f"<strong>Excellent Access</strong>: {state} has excellent trauma care accessibility with an average distance of {mean_dist:.1f} km to the nearest trauma center.")
+    elif mean_dist <= 25:
+        insights.append(f"<strong>Good Access</strong>: {state} provides reasonable trauma care access, with most residents within {mean_dist:.1f} km of emergency care.")
+    elif mean_dist <= 50:
+        insights.append(f"<strong>Moderate Access</strong>: {state} has moderate trauma care accessibility, with residents traveling an average of {mean_dist:.1f} km to reach care.")
+    else:
+        insights.append(f"<strong>Limited Access</strong>: {state} faces accessibility challenges, with residents traveling {mean_dist:.1f} km on average to reach trauma care.")
+
+    # Distribution analysis (mean vs median comparison)
+    diff_percentage = abs(mean_dist - median_dist) / median_dist * 100
+    if diff_percentage < 10:
+        insights.append(f"<strong>Even Distribution</strong>: The mean ({mean_dist:.1f} km) and median ({median_dist:.1f} km) distances are very close, indicating fairly even trauma center distribution across the state.")
+    elif mean_dist > median_dist * 1.2:
+        insights.append(f"<strong>Geographic Disparities</strong>: Some areas face significantly longer travel distances (mean {mean_dist:.1f} km vs median {median_dist:.1f} km), suggesting rural or remote areas with limited access.")
+    else:
+        insights.append(f"<strong>Slight Variation</strong>: There's some variation in access across the state, with mean distance ({mean_dist:.1f} km) slightly different from median ({median_dist:.1f} km).")
+
+    # Maximum distance analysis
+    if max_dist > 100:
+        insights.append(f"<strong>Remote Areas</strong>: Some residents face extreme distances up to {max_dist:.1f} km to reach trauma care, likely in very rural or isolated regions.")
+    elif max_dist > 50:
+        insights.append(f"<strong>Rural Challenges</strong>: The maximum distance of {max_dist:.1f} km indicates some rural areas have limited trauma care access.")
+    else:
+        insights.append(f"<strong>Reasonable Coverage</strong>: Even the most remote areas are within {max_dist:.1f} km of trauma care, showing good statewide coverage.")
+
+    # Population coverage (weighted summaries only)
+    if access is not None and access['weighted']:
+        within_30 = access['share_within'][30] * 100
+        within_60 = access['share_within'][60] * 100
+        p90 = access['percentiles'][90]
+        if within_30 >= 90:
+            insights.append(f"<strong>Broad Population Coverage</strong>: {within_30:.0f}% of {state} residents live within 30 km of a trauma center, and 90% within {p90:.1f} km.")
+        elif within_60 >= 90:
+            insights.append(f"<strong>Most Residents Covered</strong>: {within_30:.0f}% of {state} residents live within 30 km of a trauma center and {within_60:.0f}% within 60 km.")
+        else:
+            insights.append(f"<strong>Coverage Gaps</strong>: Only {within_60:.0f}% of {state} residents live within 60 km of a trauma center; one in ten lives more than {p90:.1f} km away.")
+
+    # Helipad analysis
+    helipad_percentage = (metrics['helipads'] / metrics['hospitals']) * 100 if metrics['hospitals'] > 0 else 0
+    if helipad_percentage > 50:
+        insights.append(f"<strong>Air Transport Ready</strong>: {helipad_percentage:.0f}% of trauma hospitals have helipads, providing excellent air transport capabilities for critical patients from remote areas.")
+    elif helipad_percentage > 25:
+        insights.append(f"<strong>Moderate Air Access</strong>: {helipad_percentage:.0f}% of hospitals have helipads, offering some air transport options for emergency cases.")
+    else:
+        insights.append(f"<strong>Limited Air Transport</strong>: Only {helipad_percentage:.0f}% of hospitals have helipads, which may impact rapid transport from distant locations.")
+
+    # Level 1 trauma center assessment
+    level1_percentage = (metrics['level_1_centers'] / metrics['hospitals']) * 100 if metrics['hospitals'] > 0 else 0
+    if metrics['level_1_centers'] == 0:
+        insights.append(f"<strong>No Level 1 Centers</strong>: {state} has no Level 1 trauma centers, meaning the most critical cases may need transfer to neighboring states.")
+    elif level1_percentage > 25:
+        insights.append(f"<strong>Strong Critical Care</strong>: {metrics['level_1_centers']} Level 1 trauma centers ({level1_percentage:.0f}% of hospitals) provide excellent critical care capacity.")
+    else:
+        insights.append(f"<strong>Limited Level 1 Care</strong>: {metrics['level_1_centers']} Level 1 trauma center(s) serve the entire state, which may strain resources during major incidents.")
+
+    return insights
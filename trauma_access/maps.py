@@ -0,0 +1,94 @@
+# Hospital map payloads for pydeck
+# The browser gets only what the map draws:
+#
+#   points     every hospital: lon/lat (float32), NAME, level, beds and an
+#              RGBA colour
+#   tracts     optional choropleth of nearest distance per tract, drawn from
+#              the tract store's display level for the zoom (simplified and
+#              quantized, see tracts.load_display_tracts), with only the
+#              distance and fill colour as properties
+#   areas      optional hospital service-area outlines (api.state_service_areas)
+#
+# pydeck is imported only when a deck is built.
+
+import numpy as np
+import pandas as pd
+
+COORD_DECIMALS = 5  # ~1 m
+DISTANCE_RAMP_KM = 100  # choropleth colour saturates here
+
+LEVEL_COLORS = {
+    1: [200, 30, 45, 220], 2: [240, 120, 30, 220], 3: [240, 190, 40, 220],
+    4: [60, 130, 200, 220], 5: [60, 130, 200, 220], 0: [130, 130, 130, 200],
+}
+RAMP = np.array([[255, 255, 204], [253, 141, 60], [189, 0, 38]], dtype=float)
+
+
+def hospital_points(trauma):
+    """Minimal per-hospital frame for the map (lon, lat, NAME, level, beds, color)."""
+    level = trauma['TRAUMA_LEVEL'].to_numpy().astype(int)
+    return pd.DataFrame({
+        'lon': trauma['lon'].to_numpy(dtype='float32').round(COORD_DECIMALS),
+        'lat': trauma['lat'].to_numpy(dtype='float32').round(COORD_DECIMALS),
+        'NAME': trauma['NAME'].astype(str).to_numpy(),
+        'level': level,
+        'beds': trauma['BEDS'].to_numpy().clip(0),  # -999 (not available) draws as 0
+        'color': [LEVEL_COLORS.get(v, LEVEL_COLORS[0]) for v in level],
+    })
+
+
+def view_for(points):
+    """(longitude, latitude, zoom) fitting every point."""
+    if points.empty:
+        return -98.5, 39.8, 3.0  # contiguous US
+    lon, lat = points['lon'].to_numpy(), points['lat'].to_numpy()
+    span = max(float(lon.max() - lon.min()), float(lat.max() - lat.min()) * 1.5, 0.05)
+    zoom = float(np.clip(np.log2(360 / span) - 0.5, 1, 12))
+    return float((lon.min() + lon.max()) / 2), float((lat.min() + lat.max()) / 2), zoom
+
+
+def distance_colors(distance_km):
+    """RGBA per tract on a yellow-orange-red ramp, saturating at DISTANCE_RAMP_KM."""
+    t = np.clip(np.nan_to_num(np.asarray(distance_km, dtype=float), nan=DISTANCE_RAMP_KM) / DISTANCE_RAMP_KM, 0, 1)
+    stops = np.linspace(0, 1, len(RAMP))
+    rgb = np.column_stack([np.interp(t, stops, RAMP[:, i]) for i in range(3)]).round().astype(int)
+    return [[*c, 160] for c in rgb.tolist()]
+
+
+def distance_choropleth(tracts, distances):
+    """GeoJSON dict of display `tracts` (EPSG:4326) shaded by nearest distance,
+    with only nearest_dist_km and fill as properties."""
+    frame = tracts[['GEOID', 'geometry']].merge(
+        distances[['GEOID', 'nearest_dist_km']], on='GEOID', how='left')
+    frame = frame[['nearest_dist_km', 'geometry']]
+    frame['nearest_dist_km'] = frame['nearest_dist_km'].round(1)
+    frame['fill'] = distance_colors(frame['nearest_dist_km'])
+    return frame.__geo_interface__
+
+
+def hospital_deck(points, choropleth=None, service_areas=None):
+    """pydeck Deck of hospitals over an optional choropleth from
+    distance_choropleth() and service-area outlines."""
+    import pydeck as pdk
+
+    lon, lat, zoom = view_for(points)
+
+    layers = []
+    if choropleth is not None:
+        layers.append(pdk.Layer(
+            'GeoJsonLayer', data=choropleth, get_fill_color='properties.fill',
+            stroked=False, pickable=True,
+        ))
+    if service_areas is not None:
+        layers.append(pdk.Layer(
+            'GeoJsonLayer', data=service_areas, filled=False, stroked=True,
+            get_line_color=[40, 40, 40, 180], line_width_min_pixels=1,
+        ))
+    layers.append(pdk.Layer(
+        'ScatterplotLayer', data=points, get_position=['lon', 'lat'], get_fill_color='color',
+        get_radius=6, radius_units='pixels', radius_min_pixels=3, pickable=True,
+    ))
+    return pdk.Deck(
+        layers=layers, map_style=None, tooltip={'text': '{NAME}\nLevel {level}, {beds} beds'},
+        initial_view_state=pdk.ViewState(longitude=lon, latitude=lat, zoom=zoom),
+    )
@@ -0,0 +1,72 @@
+# Summary metrics for every state in one grouped pass
+# Level I centers and their beds come from the store's parsed TRAUMA_LEVEL
+# code, and the four metric cards are a row lookup in a small table.
+# The table is built from a pandas-only read of four columns, so the state list
+# and metric cards can render before the geospatial stack is imported, and the
+# table itself is kept in the disk cache under the source hash.
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from trauma_access.diskcache import get_disk_cache
+from trauma_access.hospitals import MISSING, normalize_hospitals, read_trauma_table, source_hash
+
+METRIC_COLUMNS = ['hospitals', 'helipads', 'level_1_centers', 'level_1_beds']
+SOURCE_COLUMNS = ['STATE', 'HELIPAD', 'TRAUMA', 'BEDS']
+
+
+def metrics_table(trauma):
+    """hospitals, helipads, level_1_centers and level_1_beds per STATE.
+
+    Expects the normalized store frame (see normalize_hospitals). BEDS of -999
+    means "not available" and counts as 0 beds.
+    """
+    level_1 = trauma['TRAUMA_LEVEL'].to_numpy() == 1
+    beds = trauma['BEDS'].to_numpy()
+    frame = pd.DataFrame({
+        'STATE': trauma['STATE'],
+        'helipad': trauma['HELIPAD'].to_numpy(),
+        'level_1': level_1,
+        'level_1_beds': np.where(level_1 & (beds != MISSING), beds, 0),
+    })
+    table = frame.groupby('STATE', sort=True, observed=True).agg(
+        hospitals=('helipad', 'size'),
+        helipads=('helipad', 'sum'),
+        level_1_centers=('level_1', 'sum'),
+        level_1_beds=('level_1_beds', 'sum'),
+    )
+    return table[METRIC_COLUMNS].astype('int64')
+
+
+_tables = {}
+_tables_lock = threading.Lock()
+
+
+def get_metrics_table():
+    """Process-wide metrics table for the current hospital dataset."""
+    version = source_hash()
+    table = _tables.get(version)
+    if table is None:
+        with _tables_lock:
+            table = _tables.get(version)
+            if table is None:
+                table = get_disk_cache().get_or_create('metrics', version, lambda: metrics_table(
+                    normalize_hospitals(read_trauma_table(SOURCE_COLUMNS))))
+                _tables.clear()
+                _tables[version] = table
+    return table
+
+
+def list_states():
+    """Every state with at least one hospital, sorted."""
+    return get_metrics_table().index.tolist()
+
+
+def state_metrics(state):
+    """Metric-card values for one state (zeros for a state with no hospitals)."""
+    table = get_metrics_table()
+    if state not in table.index:
+        return dict.fromkeys(METRIC_COLUMNS, 0)
+    return {k: int(v) for k, v in table.loc[state].items()}
@@ -0,0 +1,120 @@
+# Nearest-facility engine
+# One STRtree batch query finds the nearest hospital for every tract centroid.
+# Memory is proportional to the number of tracts; each lookup is O(log m).
+
+import threading
+
+import numpy as np
+import pandas as pd
+import shapely
+from shapely import STRtree
+
+from trauma_access.profiling import stage
+
+
+class NearestFacilityIndex:
+    """Spatial index over projected hospital points.
+
+    Build once per set of facilities, then query any number of points in the
+    same (projected) CRS.
+    """
+
+    def __init__(self, facilities, id_column='ID'):
+        self._build(facilities[id_column].to_numpy(), np.asarray(facilities.geometry.values),
+                    facilities.crs, id_column)
+
+    def _build(self, ids, geoms, crs, id_column):
+        self.crs = crs
+        self.id_column = id_column
+        self.ids = ids
+        self.geoms = geoms
+        self.tree = STRtree(self.geoms)
+
+    def __len__(self):
+        return len(self.geoms)
+
+    def frame(self):
+        """ID and x/y coordinates of every facility, as a DataFrame."""
+        return pd.DataFrame({
+            self.id_column: self.ids, 'x': shapely.get_x(self.geoms), 'y': shapely.get_y(self.geoms),
+        })
+
+    def subset(self, area):
+        """New index over only the facilities intersecting `area` (an index query, not a scan)."""
+        positions = np.sort(self.tree.query(area, predicate='intersects'))
+        sub = object.__new__(type(self))
+        sub._build(self.ids[positions], self.geoms[positions], self.crs, self.id_column)
+        return sub
+
+    def edited(self, remove=(), add_ids=(), add_geoms=()):
+        """New index without the facilities in `remove` and with extra
+        facilities `add_ids` at `add_geoms` (for what-if scenarios)."""
+        keep = ~np.isin(self.ids, list(remove)) if len(remove) else np.ones(len(self.ids), dtype=bool)
+        sub = object.__new__(type(self))
+        sub._build(np.concatenate([self.ids[keep], np.asarray(list(add_ids), dtype=self.ids.dtype)]),
+                   np.concatenate([self.geoms[keep], np.asarray(list(add_geoms), dtype=object)]),
+                   self.crs, self.id_column)
+        return sub
+
+    def query(self, points, max_distance=None):
+        """Nearest facility for every point.
+
+        Returns a DataFrame indexed like `points` with the distance to the
+        nearest facility (in CRS units) and that facility's ID. Points with no
+        facility within `max_distance` (or empty geometries) get NaN / None.
+        """
+        if points.crs is not None and self.crs is not None and points.crs != self.crs:
+            raise ValueError(f"points CRS {points.crs} does not match index CRS {self.crs}")
+
+        geoms = np.asarray(points.values if hasattr(points, 'values') else points)
+        distance = np.full(len(geoms), np.nan)
+        nearest = np.full(len(geoms), None, dtype=object)
+
+        if len(self) > 0 and len(geoms) > 0:
+            (src, tree_idx), dist = self.tree.query_nearest(
+                geoms, max_distance=max_distance, return_distance=True, all_matches=False
+            )
+            distance[src] = dist
+            nearest[src] = self.ids[tree_idx]
+
+        return pd.DataFrame(
+            {'distance': distance, self.id_column: nearest},
+            index=points.index,
+        )
+
+
+# Convenience wrapper for one-off queries
+def nearest_facility(points, facilities, id_column='ID', max_distance=None):
+    return NearestFacilityIndex(facilities, id_column=id_column).query(points, max_distance=max_distance)
+
+
+_national = {}
+_national_lock = threading.Lock()
+
+
+def national_index(crs=None):
+    """Process-wide index over every hospital in the dataset, projected to `crs`.
+
+    Built once per dataset version. Querying it instead of a state-filtered
+    hospital set means tracts near a border can find a closer hospital in the
+    neighbouring state. Closed hospitals are left out, so a release marking
+    one CLOSED drops it like a removal.
+    """
+    from trauma_access.hospitals import get_hospital_store, in_service
+    from trauma_access.tracts import ANALYSIS_CRS
+
+    crs = ANALYSIS_CRS if crs is None else crs
+    store = get_hospital_store()
+    key = (store.version, str(crs))
+    index = _national.get(key)
+    if index is None:
+        with _national_lock:
+            index = _national.get(key)
+            if index is None:
+                with stage('reprojection', rows=len(store.data)):
+                    projected = in_service(store.data).to_crs(crs)
+                with stage('index_build'):
+                    index = NearestFacilityIndex(projected)
+                _national.clear()
+                _national[key] = index
+    return index
@@ -0,0 +1,71 @@
+# Local table of census-tract population
+#
+#   data/population/tract_population-<year>.parquet   GEOID, population
+#
+# Filled once from an ACS 5-year B01003 (total population) extract with
+# `python -m trauma_access ingest-population <csv>`. Everything that weights by
+# population checks population_version() first and falls back to counting
+# tracts when the table is missing. pandas only.
+
+import os
+import threading
+
+import pandas as pd
+
+from trauma_access.hospitals import REPO_DIR, source_hash
+from trauma_access.tracts import STATE_FIPS, TRACT_YEAR
+
+POPULATION_DIR = os.path.join(REPO_DIR, 'data', 'population')
+
+
+def population_path(year=TRACT_YEAR, population_dir=POPULATION_DIR):
+    return os.path.join(population_dir, f'tract_population-{year}.parquet')
+
+
+def population_version(year=TRACT_YEAR, population_dir=POPULATION_DIR):
+    """Content hash of the population table, or None when there is none."""
+    path = population_path(year, population_dir)
+    return source_hash(path) if os.path.exists(path) else None
+
+
+def ingest_population(source, year=TRACT_YEAR, population_dir=POPULATION_DIR):
+    """Store GEOID/population from a CSV.
+
+    Accepts either GEOID and population columns, or a data.census.gov /
+    Census API B01003 extract (GEO_ID like '1400000US06001400100' and
+    B01003_001E); label rows and non-tract geographies are dropped.
+    """
+    raw = pd.read_csv(source, dtype=str)
+    if {'GEOID', 'population'} <= set(raw.columns):
+        geoid, population = raw['GEOID'], raw['population']
+    else:
+        geoid, population = raw['GEO_ID'].str[-11:], raw['B01003_001E']
+    table = pd.DataFrame({'GEOID': geoid.str.strip(), 'population': pd.to_numeric(population, errors='coerce')})
+    table = table[table['GEOID'].str.fullmatch(r'\d{11}') & table['population'].notna()]
+    table = table.astype({'population': 'int64'}).sort_values('GEOID').reset_index(drop=True)
+
+    path = population_path(year, population_dir)
+    os.makedirs(population_dir, exist_ok=True)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    table.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+    return table
+
+
+_tables = {}
+_tables_lock = threading.Lock()
+
+
+def load_population(state, year=TRACT_YEAR, population_dir=POPULATION_DIR):
+    """Population per GEOID (Series) for `state`, or None without a table."""
+    version = population_version(year, population_dir)
+    if version is None:
+        return None
+    with _tables_lock:
+        table = _tables.get((year, version))
+        if table is None:
+            table = pd.read_parquet(population_path(year, population_dir)).set_index('GEOID')['population']
+            _tables.clear()
+            _tables[(year, version)] = table
+    fips = STATE_FIPS.get(state)
+    return table[table.index.str.startswith(fips)] if fips else table.iloc[:0]
@@ -0,0 +1,110 @@
+# Nationwide precompute of per-tract nearest-trauma distances
+# Each state is an independent job, so states are spread over a process pool and
+# every worker writes its own Parquet file into the versioned results store
+# (see trauma_access.results).
+#
+# The version combines the hospital dataset hash, the tract vintage and
+# RESULTS_SCHEMA, so a new trauma.geojson or a logic change never reuses stale
+# results. The dashboard reads these files instead of computing on request.
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+import shapely
+
+from trauma_access.hospitals import get_hospital_store
+from trauma_access.nearest import national_index
+from trauma_access.results import RESULTS_DIR, RESULTS_SCHEMA, facilities_path, results_path, results_version
+from trauma_access.summaries import build_summaries
+from trauma_access.tracts import (
+    BUFFER_M, OUTLINE_TOLERANCE_M, TRACT_YEAR, load_state_outline, load_tracts, tract_path,
+)
+
+
+def compute_state_distances(state_tracts, outline=None, index=None):
+    """Nearest hospital for every tract centroid.
+
+    `state_tracts` must be in ANALYSIS_CRS. Hospitals come from the national
+    index, so a closer facility across the state line is found. With the
+    state's cached `outline` (see load_state_outline) the candidates are first
+    cut to the hospitals inside its buffered envelope with one index query.
+    A bounded result is kept when it is within BUFFER_M of a centroid that lies
+    within the outline tolerance; any other tract is re-queried against the
+    full national index. Returns GEOID, nearest_dist_km and nearest_id.
+    """
+    index = national_index() if index is None else index
+    centroids = state_tracts.centroid
+
+    if outline is not None:
+        candidates = index.subset(outline['envelope'])
+        nearest = candidates.query(centroids, max_distance=BUFFER_M)
+        inside = shapely.dwithin(np.asarray(centroids.values), outline['outline'], OUTLINE_TOLERANCE_M)
+        redo = nearest['distance'].isna().to_numpy() | ~inside
+    else:
+        nearest = index.query(centroids, max_distance=BUFFER_M)
+        redo = nearest['distance'].isna().to_numpy()
+    if redo.any():
+        nearest.loc[redo] = index.query(centroids[redo])
+
+    return pd.DataFrame({
+        'GEOID': state_tracts['GEOID'].to_numpy(),
+        'nearest_dist_km': nearest['distance'].to_numpy() / 1000,
+        'nearest_id': nearest['ID'].to_numpy(),
+    })
+
+
+def _run_state(state, version, year, results_dir):
+    start = time.perf_counter()
+    state_tracts = load_tracts(state, 'analysis', year=year)
+    result = compute_state_distances(state_tracts, load_state_outline(state, year=year))
+    path = results_path(state, version, results_dir)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    result.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+    return {'state': state, 'tracts': len(result), 'seconds': round(time.perf_counter() - start, 3)}
+
+
+def run_all(states=None, workers=None, year=TRACT_YEAR, results_dir=RESULTS_DIR):
+    """Compute every state in parallel and write a manifest for the version."""
+    store = get_hospital_store()
+    states = list(states) if states else store.states
+    version = results_version(year)
+    os.makedirs(os.path.join(results_dir, version), exist_ok=True)
+    # Facility list for the next incremental refresh (see trauma_access.refresh)
+    national_index().frame().to_parquet(facilities_path(version, results_dir), index=False)
+
+    # Largest states first so the pool is not left waiting on CA/TX at the end
+    def size(state):
+        path = tract_path(state, 'analysis', year)
+        return os.path.getsize(path) if os.path.exists(path) else 0
+    states.sort(key=size, reverse=True)
+
+    done, failed = [], {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_run_state, s, version, year, results_dir): s for s in states}
+        for future in as_completed(futures):
+            state = futures[future]
+            try:
+                done.append(future.result())
+            except Exception as e:  # one bad state should not sink the national run
+                failed[state] = repr(e)
+
+    manifest = {
+        'version': version,
+        'year': year,
+        'schema': RESULTS_SCHEMA,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'states': {r['state']: r for r in sorted(done, key=lambda r: r['state'])},
+        'failed': failed,
+    }
+    # Compact per-state table for comparison and ranking (see trauma_access.summaries)
+    build_summaries(version, sorted(manifest['states']), year, results_dir)
+    path = os.path.join(results_dir, version, 'manifest.json')
+    with open(f'{path}.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(f'{path}.tmp', path)
+    return manifest
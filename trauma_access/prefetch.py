@@ -0,0 +1,125 @@
+# Background prefetch of the states a visitor is likely to pick next
+# After a state renders, its neighbours (ranked by how often each has been
+# chosen in this process) and the most chosen states overall are warmed on a
+# small thread pool through api.warm(), which fills the same process-wide
+# caches the dashboards read; the next selection is then usually a hit.
+#
+# Threads rather than processes: a worker process would only fill its own
+# memory (the disk cache aside), and the heavy parts (shapely queries, parquet
+# reads) release the GIL. At most PREFETCH_WORKERS states compute at once.
+# Each new render starts a new generation: queued work from the previous one
+# is cancelled, and a task that starts after its generation was superseded
+# returns without computing. A state already being computed is not
+# interrupted; a rerun that needs it waits for that result (LRUCache
+# de-duplicates concurrent misses).
+#
+# Off unless TRAUMA_PREFETCH=1.
+
+import logging
+import os
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+PREFETCH = os.environ.get('TRAUMA_PREFETCH') == '1'
+PREFETCH_WORKERS = int(os.environ.get('TRAUMA_PREFETCH_WORKERS', 2))
+PREFETCH_LIMIT = int(os.environ.get('TRAUMA_PREFETCH_LIMIT', 4))  # states per render
+
+logger = logging.getLogger(__name__)
+
+_BORDERS = {
+    'AL': 'FL GA MS TN', 'AZ': 'CA CO NM NV UT', 'AR': 'LA MO MS OK TN TX', 'CA': 'AZ NV OR',
+    'CO': 'AZ KS NE NM OK UT WY', 'CT': 'MA NY RI', 'DE': 'MD NJ PA', 'DC': 'MD VA',
+    'FL': 'AL GA', 'GA': 'AL FL NC SC TN', 'ID': 'MT NV OR UT WA WY', 'IL': 'IA IN KY MO WI',
+    'IN': 'IL KY MI OH', 'IA': 'IL MN MO NE SD WI', 'KS': 'CO MO NE OK',
+    'KY': 'IL IN MO OH TN VA WV', 'LA': 'AR MS TX', 'ME': 'NH', 'MD': 'DC DE PA VA WV',
+    'MA': 'CT NH NY RI VT', 'MI': 'IN OH WI', 'MN': 'IA ND SD WI', 'MS': 'AL AR LA TN',
+    'MO': 'AR IA IL KS KY NE OK TN', 'MT': 'ID ND SD WY', 'NE': 'CO IA KS MO SD WY',
+    'NV': 'AZ CA ID OR UT', 'NH': 'MA ME VT', 'NJ': 'DE NY PA', 'NM': 'AZ CO OK TX UT',
+    'NY': 'CT MA NJ PA VT', 'NC': 'GA SC TN VA', 'ND': 'MN MT SD', 'OH': 'IN KY MI PA WV',
+    'OK': 'AR CO KS MO NM TX', 'OR': 'CA ID NV WA', 'PA': 'DE MD NJ NY OH WV', 'RI': 'CT MA',
+    'SC': 'GA NC', 'SD': 'IA MN MT ND NE WY', 'TN': 'AL AR GA KY MO MS NC VA',
+    'TX': 'AR LA NM OK', 'UT': 'AZ CO ID NM NV WY', 'VT': 'MA NH NY',
+    'VA': 'DC KY MD NC TN WV', 'WA': 'ID OR', 'WV': 'KY MD OH PA VA', 'WI': 'IA IL MI MN',
+    'WY': 'CO ID MT NE SD UT',
+}
+NEIGHBORS = {state: borders.split() for state, borders in _BORDERS.items()}
+
+
+class Prefetcher:
+    """Warms likely next states in the background after each render."""
+
+    def __init__(self, workers=PREFETCH_WORKERS, limit=PREFETCH_LIMIT, year=None):
+        self.workers = workers
+        self.limit = limit
+        self.year = year
+        self.chosen = Counter()
+        self._executor = None
+        self._futures = []
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def candidates(self, state):
+        """Neighbours of `state` (most chosen first), then the most chosen states."""
+        ranked = sorted(NEIGHBORS.get(state, []), key=lambda s: -self.chosen[s])
+        ranked += [s for s, _ in self.chosen.most_common() if s not in ranked]
+        return [s for s in ranked if s != state][:self.limit]
+
+    def after_render(self, state):
+        """Record that `state` was shown and prefetch its likely successors.
+
+        Returns the states queued.
+        """
+        with self._lock:
+            self.chosen[state] += 1
+            self._generation += 1
+            generation = self._generation
+            for future in self._futures:
+                future.cancel()
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='prefetch')
+            states = self.candidates(state)
+            self._futures = [self._executor.submit(self._warm, s, generation) for s in states]
+        return states
+
+    def cancel(self):
+        """Drop queued work; states already computing finish into the cache."""
+        with self._lock:
+            self._generation += 1
+            for future in self._futures:
+                future.cancel()
+            self._futures = []
+
+    def _warm(self, state, generation):
+        if generation != self._generation:
+            return None
+        from trauma_access.api import warm
+        from trauma_access.tracts import TRACT_YEAR
+
+        for _, seconds, error in warm([state], year=self.year or TRACT_YEAR):
+            if error is not None:
+                logger.debug('prefetch of %s failed: %s', state, error)
+                return None
+            logger.debug('prefetched %s in %.2fs', state, seconds)
+            return seconds
+
+
+_prefetcher = None
+_prefetcher_lock = threading.Lock()
+
+
+def get_prefetcher():
+    """Process-wide Prefetcher, shared by every session (the latest render
+    anywhere takes priority over older queued work)."""
+    global _prefetcher
+    with _prefetcher_lock:
+        if _prefetcher is None:
+            _prefetcher = Prefetcher()
+        return _prefetcher
+
+
+def prefetch_next(state):
+    """Queue likely next states after `state` renders (no-op unless TRAUMA_PREFETCH=1)."""
+    if not PREFETCH:
+        return []
+    return get_prefetcher().after_render(state)
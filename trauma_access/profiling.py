@@ -0,0 +1,133 @@
+# Per-rerun stage timings
+# A dashboard run calls start_run() at the top of the script and finish_run()
+# at the end; in between, `with stage('name'):` blocks (in the app or inside
+# trauma_access) record wall time into the run active on the current thread.
+# Streamlit runs each session's script on its own thread. Outside a run,
+# stage() is a no-op, so batch jobs pay nothing.
+#
+# Finished runs are logged as one JSON line on the 'trauma_access.profile'
+# logger and, when TRAUMA_PROFILE_LOG names a file, appended there for
+# aggregation across sessions and processes (python -m trauma_access
+# profile-summary). A process-wide summary feeds the developer panel.
+# Overhead is two perf_counter() calls per stage and one log line per rerun.
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+PROFILE_LOG = os.environ.get('TRAUMA_PROFILE_LOG')
+
+logger = logging.getLogger('trauma_access.profile')
+_local = threading.local()
+_summary = {}
+_summary_lock = threading.Lock()
+_log_lock = threading.Lock()
+
+
+class RunProfile:
+    def __init__(self, page, **context):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.page = page
+        self.context = context
+        self.started = time.time()
+        self._start = time.perf_counter()
+        self.stages = []
+        self.total_ms = None
+
+    def record(self, name, ms, **info):
+        self.stages.append({'stage': name, 'ms': round(ms, 3), **info})
+
+    def as_dict(self):
+        return {
+            'run_id': self.run_id, 'page': self.page, 'started': round(self.started, 3),
+            'total_ms': self.total_ms, **self.context, 'stages': self.stages,
+        }
+
+
+def current_run():
+    return getattr(_local, 'profile', None)
+
+
+def start_run(page, **context):
+    """Begin profiling a rerun on this thread (replaces any unfinished run)."""
+    _local.profile = RunProfile(page, **context)
+    return _local.profile
+
+
+@contextmanager
+def stage(name, cache=None, **info):
+    """Time a block into the current run. With `cache` (an LRUCache or a
+    memoized function), also records whether the block's lookup was a hit;
+    for a memoized function that is its own call, not the nested ones.
+    Anything without last_hit is ignored."""
+    profile = current_run()
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        ms = (time.perf_counter() - start) * 1000
+        if cache is not None:
+            hit = getattr(cache, 'last_hit', None)
+            if callable(hit):
+                hit = hit()
+            if hit is not None:
+                info['cache'] = 'hit' if hit else 'miss'
+        profile.record(name, ms, **info)
+
+
+def finish_run():
+    """Close the current run: log it, add it to the summary and return it."""
+    profile = current_run()
+    if profile is None:
+        return None
+    _local.profile = None
+    profile.total_ms = round((time.perf_counter() - profile._start) * 1000, 3)
+
+    with _summary_lock:
+        for entry in [*profile.stages, {'stage': 'total', 'ms': profile.total_ms}]:
+            s = _summary.setdefault((profile.page, entry['stage']), {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+            s['count'] += 1
+            s['total_ms'] += entry['ms']
+            s['max_ms'] = max(s['max_ms'], entry['ms'])
+
+    line = json.dumps(profile.as_dict(), default=str)
+    logger.info(line)
+    if PROFILE_LOG:
+        with _log_lock, open(PROFILE_LOG, 'a') as f:
+            f.write(line + '\n')
+    return profile
+
+
+def stage_summary():
+    """Rows of page, stage, runs, mean_ms, max_ms over every run in this process."""
+    with _summary_lock:
+        items = sorted(_summary.items())
+    return [
+        {'page': page, 'stage': name, 'runs': s['count'],
+         'mean_ms': round(s['total_ms'] / s['count'], 3), 'max_ms': round(s['max_ms'], 3)}
+        for (page, name), s in items
+    ]
+
+
+def summarize_log(path=PROFILE_LOG):
+    """Per page/stage runs, mean, p95 and max ms from a TRAUMA_PROFILE_LOG file."""
+    import pandas as pd
+
+    rows = []
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                run = json.loads(line)
+                rows += [{'page': run['page'], 'stage': s['stage'], 'ms': s['ms']} for s in run['stages']]
+                rows.append({'page': run['page'], 'stage': 'total', 'ms': run['total_ms']})
+    frame = pd.DataFrame(rows, columns=['page', 'stage', 'ms'])
+    return frame.groupby(['page', 'stage'])['ms'].agg(
+        runs='size', mean_ms='mean', p95_ms=lambda ms: ms.quantile(0.95), max_ms='max',
+    ).round(3)
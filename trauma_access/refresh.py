@@ -0,0 +1,176 @@
+# Incremental refresh of the results store for a new hospital release
+# A new trauma.geojson changes the dataset version. Rather than recomputing
+# every state, the previous version's facility list (facilities.parquet,
+# written next to its results) is diffed against the current one by ID:
+#
+#   gone      removed hospitals (including ones now marked CLOSED, which the
+#             national index leaves out), and the old position of moved ones
+#   arrivals  added hospitals, and the new position of moved ones
+#
+# A tract's nearest facility can only change if it was a gone one, or if an
+# arrival is now closer than it. A state whose results name no gone facility
+# and whose outline is farther from every arrival than its worst distance is
+# carried over unchanged (hard-linked); otherwise just the affected tracts are
+# re-queried against the new national index.
+#
+# The new version is assembled in a temporary directory and renamed into
+# place, so readers see either no results for it or all of them.
+
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+import shapely
+
+from trauma_access.hospitals import get_hospital_store
+from trauma_access.nearest import national_index
+from trauma_access.precompute import compute_state_distances
+from trauma_access.results import (
+    RESULTS_DIR, RESULTS_SCHEMA, facilities_path, load_results, results_path, results_version,
+)
+from trauma_access.summaries import build_summaries
+from trauma_access.tracts import OUTLINE_TOLERANCE_M, TRACT_YEAR, has_tracts, load_state_outline, load_tracts
+
+MOVE_TOLERANCE_M = 1.0  # smaller coordinate changes are not moves
+
+
+def previous_version(year=TRACT_YEAR, results_dir=RESULTS_DIR, exclude=None):
+    """Most recent published version for `year` and the current schema that
+    kept its facility list, or None."""
+    suffix = f'-{year}-s{RESULTS_SCHEMA}'
+    candidates = []
+    if os.path.isdir(results_dir):
+        for name in os.listdir(results_dir):
+            manifest = os.path.join(results_dir, name, 'manifest.json')
+            if (name.endswith(suffix) and name != exclude and os.path.exists(manifest)
+                    and os.path.exists(facilities_path(name, results_dir))):
+                candidates.append((os.path.getmtime(manifest), name))
+    return max(candidates)[1] if candidates else None
+
+
+def diff_facilities(old, new, tolerance_m=MOVE_TOLERANCE_M):
+    """Added, removed and moved IDs between two facility frames (ID, x, y), plus
+    `gone` IDs and `arrivals` (new-position points) for the tract update."""
+    both = old.merge(new, on='ID', how='outer', suffixes=('_old', '_new'), indicator=True)
+    added = both[both['_merge'] == 'right_only']
+    removed = both[both['_merge'] == 'left_only']
+    kept = both[both['_merge'] == 'both']
+    shift = np.hypot(kept['x_new'] - kept['x_old'], kept['y_new'] - kept['y_old'])
+    moved = kept[shift.to_numpy() > tolerance_m]
+    arriving = pd.concat([added, moved])
+    return {
+        'added': added['ID'].tolist(), 'removed': removed['ID'].tolist(), 'moved': moved['ID'].tolist(),
+        'gone': set(removed['ID']) | set(moved['ID']),
+        'arrivals': shapely.points(arriving['x_new'].to_numpy(), arriving['y_new'].to_numpy()),
+    }
+
+
+def refresh_state(state, old_version, changes, year=TRACT_YEAR, results_dir=RESULTS_DIR, index=None):
+    """(results, recomputed tract count, carried over unchanged) for one state."""
+    index = national_index() if index is None else index
+    old = load_results(state, old_version, results_dir)
+    if old is None:
+        tracts = load_tracts(state, 'analysis', year=year)
+        result = compute_state_distances(tracts, load_state_outline(state, year=year), index)
+        return result, len(result), False
+
+    gone = old['nearest_id'].isin(changes['gone']).to_numpy()
+    arrivals = changes['arrivals']
+    worst_m = np.nanmax(old['nearest_dist_km'].to_numpy()) * 1000 if len(old) else 0.0
+    if len(arrivals):
+        outline = load_state_outline(state, year=year)['outline']
+        reachable = shapely.distance(arrivals, outline).min() - OUTLINE_TOLERANCE_M < worst_m
+    else:
+        reachable = False
+    if not gone.any() and not reachable:
+        return old, 0, True
+
+    tracts = load_tracts(state, 'analysis', year=year)
+    centroids = tracts.centroid.set_axis(tracts['GEOID'].to_numpy()).reindex(old['GEOID']).values
+    affected = gone | np.isnan(old['nearest_dist_km'].to_numpy())
+    if len(arrivals):
+        # Distance from each centroid to its closest arrival
+        (src, _), dist = shapely.STRtree(arrivals).query_nearest(
+            centroids, return_distance=True, all_matches=False)
+        closest = np.full(len(old), np.inf)
+        closest[src] = dist
+        affected |= closest < old['nearest_dist_km'].to_numpy() * 1000
+
+    result = old.copy()
+    if affected.any():
+        import geopandas as gpd
+
+        nearest = index.query(gpd.GeoSeries(centroids[affected], crs=index.crs))
+        result.loc[affected, 'nearest_dist_km'] = nearest['distance'].to_numpy() / 1000
+        result.loc[affected, 'nearest_id'] = nearest[index.id_column].to_numpy()
+    return result, int(affected.sum()), False
+
+
+def refresh(old_version=None, year=TRACT_YEAR, results_dir=RESULTS_DIR):
+    """Build and atomically publish results for the current dataset version
+    from `old_version` (default: the latest one with a facility list).
+
+    Returns the new manifest, or None when there is nothing to refresh from.
+    """
+    start = time.perf_counter()
+    new_version = results_version(year)
+    final = os.path.join(results_dir, new_version)
+    if os.path.exists(os.path.join(final, 'manifest.json')):
+        raise FileExistsError(f'{new_version} is already published')
+    old_version = old_version or previous_version(year, results_dir, exclude=new_version)
+    if old_version is None:
+        return None
+
+    index = national_index()
+    new_facilities = index.frame()
+    changes = diff_facilities(pd.read_parquet(facilities_path(old_version, results_dir)), new_facilities)
+    with open(os.path.join(results_dir, old_version, 'manifest.json')) as f:
+        old_states = set(json.load(f)['states'])
+    states = sorted(s for s in old_states | set(get_hospital_store().states) if has_tracts(s, year))
+
+    tmp = os.path.join(results_dir, f'.{new_version}.{os.getpid()}.tmp')
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    done, failed = {}, {}
+    for state in states:
+        state_start = time.perf_counter()
+        try:
+            result, recomputed, unchanged = refresh_state(state, old_version, changes, year, results_dir, index)
+        except Exception as e:  # one bad state should not sink the refresh
+            failed[state] = repr(e)
+            continue
+        path = os.path.join(tmp, f'{state}.parquet')
+        if unchanged:
+            _link_or_copy(results_path(state, old_version, results_dir), path)
+        else:
+            result.to_parquet(path, index=False)
+        done[state] = {'state': state, 'tracts': len(result), 'recomputed': recomputed,
+                       'seconds': round(time.perf_counter() - state_start, 3)}
+
+    new_facilities.to_parquet(os.path.join(tmp, 'facilities.parquet'), index=False)
+    build_summaries(os.path.basename(tmp), sorted(done), year, results_dir)
+    manifest = {
+        'version': new_version,
+        'year': year,
+        'schema': RESULTS_SCHEMA,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'refreshed_from': old_version,
+        'changes': {k: changes[k] for k in ('added', 'removed', 'moved')},
+        'seconds': round(time.perf_counter() - start, 3),
+        'states': done,
+        'failed': failed,
+    }
+    with open(os.path.join(tmp, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.rename(tmp, final)
+    return manifest
+
+
+def _link_or_copy(src, dst):
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
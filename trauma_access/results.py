@@ -0,0 +1,42 @@
+# Versioned store of precomputed per-tract distance results
+#
+#   data/results/<version>/<STATE>.parquet   GEOID, nearest_dist_km, nearest_id
+#   data/results/<version>/manifest.json     states, tract counts, timings
+#   data/results/<version>/facilities.parquet  ID, x, y of the hospitals used
+#                                              (lets trauma_access.refresh diff
+#                                              the next release against it)
+#   data/results/<version>/summaries-p<...>.parquet  compact per-state summaries
+#                                              (see trauma_access.summaries)
+#
+# Reading needs only pandas, so the dashboard can use results without the
+# geospatial stack. Writing happens in trauma_access.precompute.
+
+import os
+
+import pandas as pd
+
+from trauma_access.hospitals import REPO_DIR, source_hash
+from trauma_access.tracts import TRACT_YEAR
+
+RESULTS_DIR = os.path.join(REPO_DIR, 'data', 'results')
+RESULTS_SCHEMA = 3  # bump when the distance logic or output columns change (3: closed hospitals excluded)
+
+
+def results_version(year=TRACT_YEAR):
+    return f'{source_hash()}-{year}-s{RESULTS_SCHEMA}'
+
+
+def results_path(state, version, results_dir=RESULTS_DIR):
+    return os.path.join(results_dir, version, f'{state}.parquet')
+
+
+def facilities_path(version, results_dir=RESULTS_DIR):
+    return os.path.join(results_dir, version, 'facilities.parquet')
+
+
+def load_results(state, version=None, results_dir=RESULTS_DIR):
+    """Precomputed results for `state`, or None if they have not been built."""
+    path = results_path(state, version or results_version(), results_dir)
+    if not os.path.exists(path):
+        return None
+    return pd.read_parquet(path)
@@ -0,0 +1,160 @@
+# What-if facility scenarios with incremental nearest-distance updates
+# A Scenario starts from a state's nearest distances and applies edits without
+# recomputing the whole state:
+#
+#   add     only tracts within the current worst distance of the new site can
+#           get closer (one query on an STRtree of tract centroids); each of
+#           those compares its current distance with the new site's
+#   remove  only tracts whose nearest facility was the removed one change; they
+#           are re-queried against the national index minus the removals plus
+#           the added sites
+#   move    remove, then add at the new position under the same ID; an
+#           existing hospital keeps its name, trauma level and beds
+#
+# Coordinates come in as lon/lat and are projected to ANALYSIS_CRS. Scenarios
+# are per session and mutable, so they are never put in the shared caches.
+
+import itertools
+
+import numpy as np
+import pandas as pd
+import shapely
+
+from trauma_access.maps import LEVEL_COLORS, hospital_points
+from trauma_access.tracts import ANALYSIS_CRS, DISPLAY_CRS
+
+_transformers = {}
+_site_ids = itertools.count(1)
+
+
+def project_lonlat(lon, lat, crs=ANALYSIS_CRS):
+    """Point in `crs` for a lon/lat position."""
+    from pyproj import Transformer
+
+    transformer = _transformers.get(str(crs))
+    if transformer is None:
+        transformer = _transformers[str(crs)] = Transformer.from_crs(DISPLAY_CRS, crs, always_xy=True)
+    return shapely.Point(transformer.transform(lon, lat))
+
+
+class Scenario:
+    """Editable copy of one state's nearest distances."""
+
+    def __init__(self, state, geoids, centroids, distances, index, facilities=None):
+        # Rows follow `distances`, so per-tract weights aligned with it still apply
+        positions = pd.Index(geoids).get_indexer(distances['GEOID'])
+        self.state = state
+        self.geoids = distances['GEOID'].to_numpy()
+        self.centroids = np.asarray(centroids)[positions]
+        # Explicit copies: `distances` is the shared cached frame, and to_numpy()
+        # can hand back a view of it
+        self.base_km = np.array(distances['nearest_dist_km'], dtype=float)
+        self.distance_m = self.base_km * 1000
+        self.nearest_id = np.array(distances['nearest_id'], dtype=object)
+        self.index = index
+        # NAME, TRAUMA_LEVEL and BEDS of the existing hospitals, indexed by ID
+        self.facilities = facilities
+        self.removed = set()
+        self.added = {}  # id -> {'NAME', 'level', 'beds', 'lon', 'lat', 'geometry'}
+        self.edits = []
+        self._tree = None
+        self._active = None
+
+    @property
+    def centroid_tree(self):
+        if self._tree is None:
+            self._tree = shapely.STRtree(self.centroids)
+        return self._tree
+
+    def active_index(self):
+        """The national index with this scenario's removals and additions."""
+        if self._active is None:
+            self._active = self.index.edited(
+                remove=self.removed, add_ids=list(self.added),
+                add_geoms=[site['geometry'] for site in self.added.values()],
+            )
+        return self._active
+
+    def add(self, lon, lat, name='New trauma center', level=1, site_id=None):
+        """Open a facility at lon/lat; returns its ID."""
+        site_id = site_id or f'SCENARIO-{next(_site_ids)}'
+        self.edits.append(('add', site_id, round(lon, 6), round(lat, 6), int(level)))
+        return self._add(site_id, lon, lat, name, level)
+
+    def _add(self, site_id, lon, lat, name, level, beds=0):
+        geom = project_lonlat(lon, lat, self.index.crs)
+        self.added[site_id] = {'NAME': name, 'level': int(level), 'beds': int(beds),
+                               'lon': lon, 'lat': lat, 'geometry': geom}
+        self._active = None
+
+        worst = np.nanmax(self.distance_m) if np.isfinite(self.distance_m).any() else None
+        if worst is None or np.isnan(self.distance_m).any():
+            candidates = np.arange(len(self.centroids))
+        else:
+            candidates = self.centroid_tree.query(geom, predicate='dwithin', distance=worst)
+        new = shapely.distance(self.centroids[candidates], geom)
+        closer = ~(new >= self.distance_m[candidates])  # also replaces NaN
+        self.distance_m[candidates[closer]] = new[closer]
+        self.nearest_id[candidates[closer]] = site_id
+        return site_id
+
+    def remove(self, facility_id):
+        """Close a facility (an existing hospital or an added site)."""
+        self.edits.append(('remove', facility_id))
+        return self._remove(facility_id)
+
+    def _remove(self, facility_id):
+        if facility_id in self.added:
+            del self.added[facility_id]
+        else:
+            self.removed.add(facility_id)
+        self._active = None
+
+        affected = np.flatnonzero(self.nearest_id == facility_id)
+        if len(affected):
+            import geopandas as gpd
+
+            points = gpd.GeoSeries(self.centroids[affected], crs=self.index.crs)
+            nearest = self.active_index().query(points)
+            self.distance_m[affected] = nearest['distance'].to_numpy()
+            self.nearest_id[affected] = nearest[self.index.id_column].to_numpy()
+        return len(affected)
+
+    def existing(self, facility_id):
+        """{'NAME', 'level', 'beds'} of an existing hospital, or {} when unknown."""
+        if self.facilities is None or facility_id not in self.facilities.index:
+            return {}
+        row = self.facilities.loc[facility_id]
+        return {'NAME': row['NAME'], 'level': int(row['TRAUMA_LEVEL']), 'beds': int(row['BEDS'])}
+
+    def move(self, facility_id, lon, lat, name=None, level=None):
+        """Relocate a facility, keeping its ID, name, level and beds unless given."""
+        site = self.added.get(facility_id) or self.existing(facility_id)
+        level = level if level is not None else site.get('level', 1)
+        self.edits.append(('move', facility_id, round(lon, 6), round(lat, 6), int(level)))
+        self._remove(facility_id)
+        return self._add(facility_id, lon, lat, name or site.get('NAME', facility_id), level, site.get('beds', 0))
+
+    def changed(self):
+        """Boolean mask of tracts whose nearest distance differs from the base."""
+        return ~np.isclose(self.distance_m / 1000, self.base_km, equal_nan=True)
+
+    def distances(self):
+        """GEOID, nearest_dist_km and nearest_id under the scenario."""
+        return pd.DataFrame({
+            'GEOID': self.geoids, 'nearest_dist_km': self.distance_m / 1000, 'nearest_id': self.nearest_id,
+        })
+
+    def map_points(self, trauma):
+        """hospital_points() of the state's hospitals with the scenario applied."""
+        moved = self.removed | set(self.added)
+        points = hospital_points(trauma[~trauma['ID'].isin(moved)])
+        if not self.added:
+            return points
+        sites = pd.DataFrame([
+            {'lon': s['lon'], 'lat': s['lat'], 'NAME': s['NAME'], 'level': s['level'], 'beds': max(s['beds'], 0),
+             'color': [*LEVEL_COLORS.get(s['level'], LEVEL_COLORS[0])[:3], 255]}
+            for s in self.added.values()
+        ])
+        sites[['lon', 'lat']] = sites[['lon', 'lat']].astype('float32')
+        return pd.concat([points, sites], ignore_index=True)
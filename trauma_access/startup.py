@@ -0,0 +1,49 @@
+# Import-time budget for the dashboard
+# The dashboards paint the title, state selector and metric cards using pandas
+# only, then call load_geo_stack() before the first geospatial work. That call
+# times each heavy import once per process so the cost is visible. A warning is
+# logged when the total exceeds the budget (TRAUMA_IMPORT_BUDGET_S, seconds).
+
+import importlib
+import logging
+import os
+import sys
+import time
+
+GEO_MODULES = ['shapely', 'pyproj', 'geopandas', 'pyogrio', 'matplotlib']
+IMPORT_BUDGET_S = float(os.environ.get('TRAUMA_IMPORT_BUDGET_S', '3.0'))
+
+logger = logging.getLogger('trauma_access.startup')
+_import_times = {}
+
+
+def timed_import(name):
+    """Import `name`, recording how long it took if this is the first import."""
+    if name in sys.modules:
+        return sys.modules[name]
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    _import_times[name] = time.perf_counter() - start
+    return module
+
+
+def import_report():
+    total = sum(_import_times.values())
+    return {
+        'modules': dict(_import_times),
+        'total': total,
+        'budget': IMPORT_BUDGET_S,
+        'over_budget': total > IMPORT_BUDGET_S,
+    }
+
+
+def load_geo_stack():
+    """Import the geospatial/plotting modules now (timed) and return the report."""
+    already_loaded = all(name in sys.modules for name in GEO_MODULES)
+    for name in GEO_MODULES:
+        timed_import(name)
+    report = import_report()
+    if not already_loaded and report['over_budget']:
+        logger.warning('geospatial imports took %.2fs (budget %.2fs): %s', report['total'],
+                       report['budget'], {k: round(v, 3) for k, v in report['modules'].items()})
+    return report
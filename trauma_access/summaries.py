@@ -0,0 +1,122 @@
+# Compact per-state summaries for side-by-side comparison and national ranking
+#
+#   data/results/<version>/summaries-p<population version|none>.parquet
+#
+# One row per state: the metric-card values, the access_summary() scalars
+# (mean, max, percentiles, share within each threshold) and the population
+# counts on the fixed BIN_EDGES_KM bins as a list column. Bins are the same for
+# every state, so a state's histogram and coverage curve are rebuilt from its
+# row, and comparing 10 or 51 states reads one small table instead of tract
+# results or geometries. Written after precompute/refresh and otherwise built
+# on first use from the results files; reading needs only pandas.
+
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from trauma_access.access import BIN_EDGES_KM, PERCENTILES, THRESHOLDS_KM, access_summary
+from trauma_access.metrics import get_metrics_table
+from trauma_access.population import load_population, population_version
+from trauma_access.results import RESULTS_DIR, load_results, results_version
+from trauma_access.tracts import TRACT_YEAR
+
+PERCENTILE_COLUMNS = [f'p{p}' for p in PERCENTILES]
+WITHIN_COLUMNS = [f'within_{km}km' for km in THRESHOLDS_KM]
+SUMMARY_COLUMNS = (['state', 'weighted', 'total', 'tracts', 'mean', 'max'] + PERCENTILE_COLUMNS
+                   + WITHIN_COLUMNS + ['counts'])
+# Ranking keys: lower is better for distances, higher for the shares within reach
+RANK_ASCENDING = {'mean': True, 'max': True, **{c: True for c in PERCENTILE_COLUMNS},
+                  **{c: False for c in WITHIN_COLUMNS}}
+
+
+def summaries_path(version, year=TRACT_YEAR, results_dir=RESULTS_DIR):
+    return os.path.join(results_dir, version, f"summaries-p{population_version(year) or 'none'}.parquet")
+
+
+def summary_row(state, access):
+    """One summary row from a state's access_summary()."""
+    row = {'state': state, 'weighted': access['weighted'], 'total': access['total'], 'tracts': access['tracts'],
+           'mean': access['mean'], 'max': access['max']}
+    row.update({f'p{p}': km for p, km in access['percentiles'].items()})
+    row.update({f'within_{km}km': share for km, share in access['share_within'].items()})
+    row['counts'] = np.asarray(access['counts'], dtype=float)
+    return row
+
+
+def summary_table(rows):
+    """Summary rows as a frame indexed by state, with the metric-card columns."""
+    table = pd.DataFrame(list(rows), columns=SUMMARY_COLUMNS).set_index('state')
+    return get_metrics_table().reindex(table.index).fillna(0).astype('int64').join(table)
+
+
+def build_summaries(version=None, states=None, year=TRACT_YEAR, results_dir=RESULTS_DIR):
+    """Summarize every state with results in `version` (default: current) and
+    write the table next to them. Returns the table."""
+    version = version or results_version(year)
+    if states is None:
+        names = (os.path.splitext(n) for n in os.listdir(os.path.join(results_dir, version)))
+        states = sorted(stem for stem, ext in names if ext == '.parquet' and len(stem) == 2 and stem.isupper())
+    rows = []
+    for state in states:
+        distances = load_results(state, version, results_dir)
+        if distances is None:
+            continue
+        population = load_population(state, year)
+        weights = None if population is None else distances['GEOID'].map(population).fillna(0).to_numpy()
+        rows.append(summary_row(state, access_summary(distances['nearest_dist_km'], weights)))
+    table = summary_table(rows)
+
+    path = summaries_path(version, year, results_dir)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    table.assign(counts=table['counts'].map(list)).to_parquet(tmp)
+    os.replace(tmp, path)
+    return table
+
+
+_tables = {}
+_tables_lock = threading.Lock()
+
+
+def load_summaries(year=TRACT_YEAR, results_dir=RESULTS_DIR):
+    """Summary table for the current dataset version, built from the results
+    store if needed; None when no results have been published for it."""
+    version = results_version(year)
+    path = summaries_path(version, year, results_dir)
+    with _tables_lock:
+        table = _tables.get(path)
+        if table is None:
+            if os.path.exists(path):
+                table = pd.read_parquet(path)
+                table['counts'] = table['counts'].map(np.asarray)
+            elif os.path.isdir(os.path.join(results_dir, version)):
+                table = build_summaries(version, year=year, results_dir=results_dir)
+            else:
+                return None
+            _tables.clear()
+            _tables[path] = table
+    return table
+
+
+def ranking_table(summaries, by='mean'):
+    """States ordered best first on `by`, with a 1-based rank column."""
+    ranked = summaries.drop(columns='counts').sort_values(by, ascending=RANK_ASCENDING[by], na_position='last')
+    ranked.insert(0, 'rank', ranked[by].rank(method='min', ascending=RANK_ASCENDING[by]).astype('Int64'))
+    return ranked
+
+
+def distribution_frame(summaries, states, cumulative=False):
+    """Tidy (state, start, end, share) rows of each state's distance
+    distribution on the fixed bins, as shares of its total so states of any
+    size compare; with `cumulative`, the share within each bin's upper edge."""
+    frames = []
+    for state in states:
+        counts = summaries.loc[state, 'counts']
+        total = counts.sum()
+        share = counts / total if total > 0 else np.zeros_like(counts)
+        frames.append(pd.DataFrame({
+            'state': state, 'start': BIN_EDGES_KM[:-1], 'end': BIN_EDGES_KM[1:],
+            'share': np.cumsum(share) if cumulative else share,
+        }))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['state', 'start', 'end', 'share'])
@@ -0,0 +1,207 @@
+# Local census-tract store
+# Tracts are ingested once (from pygris or a downloaded TIGER cartographic
+# boundary file) and written per state as GeoParquet, already projected to both
+# the display CRS and the metric CRS used for the distance analysis, plus a
+# simplified state outline and its buffered search envelope, and display
+# levels of detail: per zoom band, a topology-preserving simplification
+# quantized to a coarse coordinate grid in EPSG:4326 (the analysis file keeps
+# full resolution for exact centroids).
+#
+# Reads are local: a state missing from the store raises FileNotFoundError
+# pointing at `ingest-tracts`, unless TRAUMA_ALLOW_DOWNLOAD=1 lets it be
+# fetched on first use. pygris is imported lazily and only by ingest_tracts(),
+# and geopandas/shapely only when tracts are actually read or built.
+
+import os
+
+from trauma_access.hospitals import REPO_DIR
+
+TRACT_YEAR = 2021
+TRACT_DIR = os.path.join(REPO_DIR, 'data', 'tracts')
+DISPLAY_CRS = 'EPSG:4326'
+ANALYSIS_CRS = 6571  # metric CRS the dashboards have always used for distances
+CRS_BY_KIND = {'display': DISPLAY_CRS, 'analysis': ANALYSIS_CRS}
+BUFFER_M = 100000  # hospitals this far outside a state are still candidates
+OUTLINE_TOLERANCE_M = 500
+# Display levels of detail: (min map zoom, simplification tolerance in m, decimals kept)
+DISPLAY_LEVELS = [(0, 2000, 3), (7, 400, 4), (10, 50, 5)]
+TRACT_COLUMNS = ['GEOID', 'STATEFP', 'COUNTYFP', 'TRACTCE', 'NAME', 'ALAND', 'AWATER']
+
+# Opt-in for development: fetch a state missing from the store through pygris
+ALLOW_DOWNLOAD = os.environ.get('TRAUMA_ALLOW_DOWNLOAD', '') in ('1', 'true', 'yes')
+
+STATE_FIPS = {
+    'AL': '01', 'AK': '02', 'AZ': '04', 'AR': '05', 'CA': '06', 'CO': '08', 'CT': '09',
+    'DE': '10', 'DC': '11', 'FL': '12', 'GA': '13', 'HI': '15', 'ID': '16', 'IL': '17',
+    'IN': '18', 'IA': '19', 'KS': '20', 'KY': '21', 'LA': '22', 'ME': '23', 'MD': '24',
+    'MA': '25', 'MI': '26', 'MN': '27', 'MS': '28', 'MO': '29', 'MT': '30', 'NE': '31',
+    'NV': '32', 'NH': '33', 'NJ': '34', 'NM': '35', 'NY': '36', 'NC': '37', 'ND': '38',
+    'OH': '39', 'OK': '40', 'OR': '41', 'PA': '42', 'RI': '44', 'SC': '45', 'SD': '46',
+    'TN': '47', 'TX': '48', 'UT': '49', 'VT': '50', 'VA': '51', 'WA': '53', 'WV': '54',
+    'WI': '55', 'WY': '56', 'PR': '72',
+}
+
+
+def tract_path(state, kind='analysis', year=TRACT_YEAR, tract_dir=TRACT_DIR):
+    return os.path.join(tract_dir, str(year), f'{state}-{kind}.parquet')
+
+
+def has_tracts(state, year=TRACT_YEAR, tract_dir=TRACT_DIR):
+    return all(os.path.exists(tract_path(state, kind, year, tract_dir)) for kind in CRS_BY_KIND)
+
+
+def _write_parquet(gdf, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    gdf.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def ingest_tracts(state, year=TRACT_YEAR, source=None, tract_dir=TRACT_DIR):
+    """Store one state's tracts in both CRSs.
+
+    `source` is a local TIGER cartographic boundary file (shapefile, zip or
+    GeoPackage, per-state or national); without it the tracts are fetched
+    through pygris.
+    """
+    import geopandas as gpd
+
+    if source is None:
+        from pygris import tracts  # optional ingestion backend
+        raw = tracts(state, cb=True, year=year, cache=True)
+    else:
+        raw = gpd.read_file(source)
+        if 'STATEFP' in raw.columns:
+            raw = raw[raw['STATEFP'] == STATE_FIPS[state]]
+
+    raw = raw[[c for c in TRACT_COLUMNS if c in raw.columns] + ['geometry']]
+    raw = raw.sort_values('GEOID').reset_index(drop=True)
+    for kind, crs in CRS_BY_KIND.items():
+        _write_parquet(raw.to_crs(crs), tract_path(state, kind, year, tract_dir))
+    analysis = load_tracts(state, 'analysis', year, tract_dir, allow_download=False)
+    _write_parquet(build_state_outline(analysis), outline_path(state, year, tract_dir))
+    _write_parquet(build_display_levels(analysis), lod_path(state, year, tract_dir))
+    return raw
+
+
+def load_tracts(state, kind='analysis', year=TRACT_YEAR, tract_dir=TRACT_DIR, allow_download=None):
+    """Read one state's tracts, already projected for `kind` ('display' or 'analysis')."""
+    if kind not in CRS_BY_KIND:
+        raise ValueError(f"kind must be one of {list(CRS_BY_KIND)}, got {kind!r}")
+    if allow_download is None:
+        allow_download = ALLOW_DOWNLOAD
+
+    import geopandas as gpd
+
+    path = tract_path(state, kind, year, tract_dir)
+    if not os.path.exists(path):
+        if not allow_download:
+            raise FileNotFoundError(
+                f"No local tracts for {state} ({year}); run "
+                f"`python -m trauma_access ingest-tracts {state}` first"
+            )
+        ingest_tracts(state, year=year, tract_dir=tract_dir)
+    return gpd.read_parquet(path)
+
+
+def outline_path(state, year=TRACT_YEAR, tract_dir=TRACT_DIR):
+    return os.path.join(tract_dir, str(year), f'{state}-outline.parquet')
+
+
+def build_state_outline(analysis_tracts):
+    """Simplified state outline and its BUFFER_M search envelope (ANALYSIS_CRS).
+
+    The union snaps to a 1 m grid so the hairline gaps between neighbouring
+    tract polygons close up. Buffering the simplified result is then cheap,
+    unlike buffering the raw dissolve.
+    """
+    import geopandas as gpd
+    import shapely
+
+    outline = shapely.union_all(analysis_tracts.geometry.values, grid_size=1.0)
+    outline = shapely.simplify(outline, OUTLINE_TOLERANCE_M)
+    # Padding by the tolerance keeps every hospital within BUFFER_M of the true
+    # (unsimplified) state inside the envelope
+    envelope = shapely.buffer(outline, BUFFER_M + OUTLINE_TOLERANCE_M)
+    return gpd.GeoDataFrame({'kind': ['outline', 'envelope']}, geometry=[outline, envelope],
+                            crs=analysis_tracts.crs)
+
+
+def load_state_outline(state, year=TRACT_YEAR, tract_dir=TRACT_DIR, allow_download=None):
+    """Cached outline/envelope for `state`, built from its tracts on first use."""
+    import geopandas as gpd
+
+    path = outline_path(state, year, tract_dir)
+    if os.path.exists(path):
+        outline = gpd.read_parquet(path)
+    else:
+        outline = build_state_outline(load_tracts(state, 'analysis', year, tract_dir, allow_download))
+        _write_parquet(outline, path)
+    return outline_geometries(outline)
+
+
+def outline_geometries(outline):
+    """{'outline': geom, 'envelope': geom} from a build_state_outline() frame."""
+    return dict(zip(outline['kind'], outline.geometry.values))
+
+
+def lod_path(state, year=TRACT_YEAR, tract_dir=TRACT_DIR):
+    return os.path.join(tract_dir, str(year), f'{state}-lod.parquet')
+
+
+def display_level(zoom=None):
+    """Min zoom of the DISPLAY_LEVELS entry to draw at map `zoom` (finest if None)."""
+    levels = [level for level, _, _ in DISPLAY_LEVELS]
+    if zoom is None:
+        return levels[-1]
+    return max([level for level in levels if level <= zoom], default=levels[0])
+
+
+def simplify_coverage(geometries, tolerance):
+    """Simplify polygons that tile the state without opening gaps or overlaps
+    between neighbours.
+
+    Snapping to a 1 m grid first makes the shared edges of neighbouring tracts
+    identical (as for the outline); if they still do not form a clean coverage,
+    each polygon is simplified on its own.
+    """
+    import shapely
+
+    snapped = shapely.set_precision(geometries, 1.0)
+    if shapely.coverage_is_valid(snapped):
+        return shapely.coverage_simplify(snapped, tolerance)
+    return shapely.simplify(snapped, tolerance, preserve_topology=True)
+
+
+def build_display_levels(analysis_tracts):
+    """GEOID, zoom and geometry (EPSG:4326) for every DISPLAY_LEVELS entry.
+
+    Simplification runs in the metric CRS; coordinates are then snapped to a
+    10**-decimals degree grid, so shared edges stay shared and the encoded
+    payload is small. Tracts that collapse at a coarse level are dropped there.
+    """
+    import geopandas as gpd
+    import pandas as pd
+    import shapely
+
+    frames = []
+    for zoom, tolerance, decimals in DISPLAY_LEVELS:
+        simplified = simplify_coverage(analysis_tracts.geometry.values, tolerance)
+        level = gpd.GeoDataFrame({'GEOID': analysis_tracts['GEOID'].to_numpy(), 'zoom': zoom},
+                                 geometry=simplified, crs=analysis_tracts.crs).to_crs(DISPLAY_CRS)
+        level = level.set_geometry(shapely.set_precision(level.geometry.values, 10 ** -decimals))
+        frames.append(level[~level.geometry.is_empty])
+    return gpd.GeoDataFrame(pd.concat(frames, ignore_index=True), crs=DISPLAY_CRS)
+
+
+def load_display_tracts(state, zoom=None, year=TRACT_YEAR, tract_dir=TRACT_DIR, allow_download=None):
+    """Simplified, quantized tracts (GEOID, geometry in EPSG:4326) for map `zoom`,
+    built from the analysis tracts on first use."""
+    import geopandas as gpd
+
+    level = display_level(zoom)
+    path = lod_path(state, year, tract_dir)
+    if not os.path.exists(path):
+        _write_parquet(build_display_levels(load_tracts(state, 'analysis', year, tract_dir, allow_download)), path)
+    tracts = gpd.read_parquet(path, filters=[('zoom', '==', level)])
+    return tracts[['GEOID', 'geometry']].reset_index(drop=True)
@@ -0,0 +1,190 @@
+# Approximate travel time to the nearest trauma center over a friction raster
+# Straight-line distance understates access where roads wind through mountains
+# or around water. Here each state has a local friction raster (minutes to
+# cross one km of each cell, on a grid in ANALYSIS_CRS):
+#
+#   data/cost/friction-<ST>.npz   friction (float32, rows north to south; NaN or
+#                                 inf is impassable), origin (x, y of the top-left
+#                                 corner) and cell_size (m)
+#
+# One multi-source Dijkstra pass, seeded at every hospital around the state at
+# once, gives the minimum cost to every cell; each tract then reads the cell
+# under its centroid. The raster is processed in tiles (sharing one row and
+# column with their neighbours) so large states fit in memory: a tile is
+# searched from its current cell costs, and any improvement on a shared edge
+# re-queues the neighbouring tile until nothing changes. Graphs are built with
+# NumPy (8-connected, edge cost = mean friction x step length) and searched with
+# scipy.sparse.csgraph.
+#
+# ingest_cost_raster() cuts a state's grid from a larger GeoTIFF friction
+# surface; rasterio is imported lazily and only there.
+
+import os
+
+import numpy as np
+
+from trauma_access.hospitals import REPO_DIR, source_hash
+from trauma_access.tracts import ANALYSIS_CRS, TRACT_YEAR, load_state_outline
+
+COST_DIR = os.path.join(REPO_DIR, 'data', 'cost')
+TILE_CELLS = 512  # tile side; a tile's graph is about TILE_CELLS ** 2 nodes and 8x as many edges
+STEPS = [(0, 1), (1, 0), (1, 1), (1, -1)]  # each neighbour pair once; edges go both ways
+
+
+def cost_raster_path(state, cost_dir=COST_DIR):
+    return os.path.join(cost_dir, f'friction-{state}.npz')
+
+
+def has_cost_raster(state, cost_dir=COST_DIR):
+    return os.path.exists(cost_raster_path(state, cost_dir))
+
+
+def cost_raster_version(state, cost_dir=COST_DIR):
+    """Content hash of the state's friction raster, or None when there is none."""
+    path = cost_raster_path(state, cost_dir)
+    return source_hash(path) if os.path.exists(path) else None
+
+
+def save_cost_raster(state, friction, origin, cell_size, cost_dir=COST_DIR):
+    path = cost_raster_path(state, cost_dir)
+    os.makedirs(cost_dir, exist_ok=True)
+    tmp = f'{path}.{os.getpid()}.tmp.npz'
+    np.savez_compressed(tmp, friction=np.asarray(friction, dtype='float32'),
+                        origin=np.asarray(origin, dtype=float), cell_size=float(cell_size))
+    os.replace(tmp, path)
+    return path
+
+
+def load_cost_raster(state, cost_dir=COST_DIR):
+    """{'friction', 'origin', 'cell_size'} for `state`."""
+    with np.load(cost_raster_path(state, cost_dir)) as raster:
+        return {'friction': raster['friction'], 'origin': tuple(raster['origin']),
+                'cell_size': float(raster['cell_size'])}
+
+
+def ingest_cost_raster(state, source, cell_size=1000, scale=1000.0, year=TRACT_YEAR, cost_dir=COST_DIR):
+    """Resample a friction GeoTIFF onto a grid over the state's search envelope.
+
+    `source` values are multiplied by `scale` to give minutes per km (the
+    default suits surfaces in minutes per metre, such as the Malaria Atlas
+    Project motorized friction surface).
+    """
+    import rasterio
+    from rasterio.transform import from_origin
+    from rasterio.warp import Resampling, reproject
+
+    minx, miny, maxx, maxy = load_state_outline(state, year=year)['envelope'].bounds
+    width, height = int(np.ceil((maxx - minx) / cell_size)), int(np.ceil((maxy - miny) / cell_size))
+    friction = np.full((height, width), np.nan, dtype='float32')
+    with rasterio.open(source) as src:
+        reproject(
+            rasterio.band(src, 1), friction, dst_transform=from_origin(minx, maxy, cell_size, cell_size),
+            dst_crs=f'EPSG:{ANALYSIS_CRS}', dst_nodata=np.nan, resampling=Resampling.average,
+        )
+    save_cost_raster(state, friction * scale, (minx, maxy), cell_size, cost_dir)
+    return friction
+
+
+def raster_cells(x, y, origin, cell_size, shape):
+    """(row, col) of the cells under points, and a mask of those on the grid."""
+    col = np.floor((np.asarray(x) - origin[0]) / cell_size).astype('int64')
+    row = np.floor((origin[1] - np.asarray(y)) / cell_size).astype('int64')
+    inside = (row >= 0) & (row < shape[0]) & (col >= 0) & (col < shape[1])
+    return row, col, inside
+
+
+def _tile_edges(friction, cell_size):
+    """Directed edges (source, target, minutes) of the 8-connected grid graph."""
+    height, width = friction.shape
+    ids = np.arange(height * width).reshape(height, width)
+    sources, targets, minutes = [], [], []
+    for dr, dc in STEPS:
+        left, right = max(0, -dc), max(0, dc)
+        a = (slice(0, height - dr), slice(left, width - right))
+        b = (slice(dr, height), slice(right, width - left))
+        cost = (friction[a] + friction[b]) * (0.5 * np.hypot(dr, dc) * cell_size / 1000)
+        ok = np.isfinite(cost)
+        sources += [ids[a][ok], ids[b][ok]]
+        targets += [ids[b][ok], ids[a][ok]]
+        minutes += [cost[ok], cost[ok]]
+    return np.concatenate(sources), np.concatenate(targets), np.concatenate(minutes)
+
+
+def _search_tile(friction, start, cell_size):
+    """Minimum cost to each cell of a tile given starting costs `start` (inf
+    where unknown), through a virtual source linked to every known cell."""
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import dijkstra
+
+    n = friction.size
+    sources, targets, minutes = _tile_edges(friction, cell_size)
+    known = np.flatnonzero(np.isfinite(start))
+    # The +1 keeps zero-cost links from the virtual source explicit in the sparse graph
+    graph = csr_matrix((
+        np.concatenate([minutes, start.ravel()[known] + 1]),
+        (np.concatenate([sources, np.full(len(known), n)]), np.concatenate([targets, known])),
+    ), shape=(n + 1, n + 1))
+    return (dijkstra(graph, directed=True, indices=n)[:n] - 1).reshape(friction.shape)
+
+
+def cost_surface(friction, seeds, cell_size, tile=TILE_CELLS):
+    """Minutes from the nearest seed cell to every cell (inf where unreachable).
+
+    `seeds` is (rows, cols) of the hospital cells.
+    """
+    friction = np.where(np.isfinite(friction) & (friction > 0), friction, np.nan).astype(float)
+    rows, cols = (np.asarray(s, dtype='int64') for s in seeds)
+    # A hospital on an impassable cell (a pier, a nodata edge) can still be left
+    friction[rows, cols] = np.where(np.isnan(friction[rows, cols]), np.nanmedian(friction), friction[rows, cols])
+    cost = np.full(friction.shape, np.inf)
+    cost[rows, cols] = 0.0
+
+    queue = {t for r, c in zip(rows, cols) for t in _tiles_holding(r, c, tile, friction.shape)}
+    while queue:
+        r0, c0 = queue.pop()
+        window = (slice(r0, r0 + tile + 1), slice(c0, c0 + tile + 1))
+        before = cost[window]
+        after = np.minimum(_search_tile(friction[window], before, cell_size), before)
+        improved = after < before - 1e-6
+        if not improved.any():
+            continue
+        cost[window] = after
+        # Cells on the window's last row or column also belong to the next tiles
+        # (and its first ones to the previous), so those tiles are searched again
+        r_idx, c_idx = np.nonzero(improved)
+        r_idx, c_idx = r_idx + r0, c_idx + c0
+        edge = (r_idx % tile == 0) | (c_idx % tile == 0)
+        for r, c in zip(r_idx[edge], c_idx[edge]):
+            queue.update(_tiles_holding(r, c, tile, cost.shape) - {(r0, c0)})
+    return cost
+
+
+def _tiles_holding(r, c, tile, shape):
+    """Top-left corners of the tile windows that contain cell (r, c)."""
+    tile_rows = {r // tile * tile, r - tile if r % tile == 0 else -1}
+    tile_cols = {c // tile * tile, c - tile if c % tile == 0 else -1}
+    return {(tr, tc) for tr in tile_rows for tc in tile_cols
+            if 0 <= tr < shape[0] and 0 <= tc < shape[1]}
+
+
+def travel_times(raster, facilities, centroids, tile=TILE_CELLS):
+    """Minutes from each centroid's cell to the nearest facility (NaN off the
+    grid or where no facility is reachable).
+
+    `facilities` and `centroids` are point geometries in ANALYSIS_CRS.
+    """
+    import shapely
+
+    friction, origin, cell_size = raster['friction'], raster['origin'], raster['cell_size']
+    xy = shapely.get_coordinates(facilities)
+    rows, cols, inside = raster_cells(xy[:, 0], xy[:, 1], origin, cell_size, friction.shape)
+    times = np.full(len(centroids), np.nan)
+    if not inside.any():
+        return times
+    surface = cost_surface(friction, (rows[inside], cols[inside]), cell_size, tile)
+
+    xy = shapely.get_coordinates(centroids)
+    rows, cols, inside = raster_cells(xy[:, 0], xy[:, 1], origin, cell_size, friction.shape)
+    times[inside] = surface[rows[inside], cols[inside]]
+    times[np.isinf(times)] = np.nan
+    return times